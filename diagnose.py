@@ -7,6 +7,8 @@ and help troubleshoot common issues.
 import sys
 import os
 import json
+import importlib.metadata
+import importlib.util
 from pathlib import Path
 
 # Ensure src package is importable when running from repo root
@@ -43,19 +45,26 @@ def check_python_version():
 
 
 def check_package(package_name, import_name=None):
-    """Check if a package is installed"""
+    """Check if a package is installed (metadata-only, no module import)"""
     if import_name is None:
         import_name = package_name
-    
+
     try:
-        module = __import__(import_name)
-        version = getattr(module, '__version__', 'unknown')
-        print(f"   ✓ {package_name:20s} {version}")
-        return True
-    except ImportError:
+        spec = importlib.util.find_spec(import_name)
+    except (ImportError, ValueError):
+        spec = None
+
+    if spec is None:
         print(f"   ✗ {package_name:20s} NOT INSTALLED")
         return False
 
+    try:
+        version = importlib.metadata.version(package_name)
+    except importlib.metadata.PackageNotFoundError:
+        version = 'unknown'
+    print(f"   ✓ {package_name:20s} {version}")
+    return True
+
 
 def check_dependencies():
     """Check all required packages"""
@@ -119,17 +128,19 @@ def check_airsim_settings():
     """Check AirSim settings file"""
     print_section("4. AirSim Configuration")
     
-    # Common AirSim settings locations
+    # Common AirSim settings locations (expand $HOME once, not per path)
+    home = os.path.expanduser("~")
     possible_paths = [
-        os.path.expanduser("~/Documents/AirSim/settings.json"),
-        os.path.expanduser("~/.config/AirSim/settings.json"),
+        f"{home}/Documents/AirSim/settings.json",
+        f"{home}/.config/AirSim/settings.json",
         "./settings.json",
         "./airsim_swarm_llm/settings.json",
     ]
-    
+
     settings_found = None
     for path in possible_paths:
-        if os.path.exists(path):
+        # single stat() per candidate
+        if Path(path).is_file():
             settings_found = path
             break
     
@@ -203,10 +214,19 @@ def test_llm_api():
 def test_airsim_connection():
     """Test AirSim connection"""
     print_section("6. AirSim Connection Test")
-    
+
+    # Cheap socket probe first: skips the heavy airsim import and the
+    # blocking RPC handshake entirely when the port isn't even open
+    import socket
+    try:
+        socket.create_connection(("127.0.0.1", 41451), timeout=0.5).close()
+    except OSError:
+        print("   ⚠ AirSim RPC port 41451 is closed (is AirSim running?)")
+        return False
+
     try:
         import airsim
-        
+
         print("   Attempting to connect to AirSim at 127.0.0.1...")
         client = airsim.MultirotorClient(ip="127.0.0.1")
         
@@ -7,6 +7,9 @@ import sys
 import json
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from scipy.optimize import linear_sum_assignment
+from scipy.spatial.distance import cdist
 from pathlib import Path
 
 
@@ -21,18 +24,25 @@ def load_goals(json_path: str) -> tuple:
 
 def load_drone_initial_positions(settings_path: str = "settings.json") -> dict:
     """Load drone initial positions from AirSim settings.json"""
-    with open(settings_path, 'r', encoding='utf-8') as f:
-        settings = json.load(f)
-    
+    raw = Path(settings_path).read_bytes()
+    try:
+        # orjson parses large swarm configs several times faster
+        import orjson
+        settings = orjson.loads(raw)
+    except ImportError:
+        settings = json.loads(raw)
+
     vehicles = settings.get("Vehicles", {})
+
+    # One (N, 3) allocation; per-drone entries are row views into it
+    coords = np.empty((len(vehicles), 3), dtype=np.float64)
     positions = {}
-    
-    for drone_name, config in vehicles.items():
-        x = config.get("X", 0)
-        y = config.get("Y", 0)
-        z = config.get("Z", 0)
-        positions[drone_name] = np.array([float(x), float(y), float(z)])
-    
+    for i, (drone_name, config) in enumerate(vehicles.items()):
+        coords[i, 0] = float(config.get("X", 0))
+        coords[i, 1] = float(config.get("Y", 0))
+        coords[i, 2] = float(config.get("Z", 0))
+        positions[drone_name] = coords[i]
+
     return positions
 
 
@@ -59,48 +69,27 @@ def plot_assignments(goals_ned: np.ndarray, drone_positions: dict, output_path:
     print()
     print("-" * 80)
     
-    distances = np.zeros((n_drones, goals_xy.shape[0]))
+    distances = cdist(drones_xy, goals_xy)
     for d, name in enumerate(drone_names):
         print(f"{name:<10}", end='')
         for g in range(goals_xy.shape[0]):
-            dist = np.linalg.norm(drones_xy[d] - goals_xy[g])
-            distances[d, g] = dist
-            print(f"{dist:7.3f}  ", end='')
+            print(f"{distances[d, g]:7.3f}  ", end='')
         print()
     
     print("\n" + "="*80)
-    print("GREEDY NEAREST UNIQUE ASSIGNMENT")
+    print("OPTIMAL ASSIGNMENT (HUNGARIAN)")
     print("="*80 + "\n")
-    
-    # Simulate assignment algorithm
-    assigned_goals = set()
-    assignments = {}
-    
-    # Order drones by descending minimal distance (farther drones pick first)
-    min_dists = distances.min(axis=1)
-    drone_order = np.argsort(-min_dists)
-    
-    for di in drone_order:
+
+    # Globally optimal pairing (minimizes total travel distance)
+    row_ind, col_ind = linear_sum_assignment(distances)
+    assignments = dict(zip(row_ind, col_ind))
+
+    for di, pick in assignments.items():
         drone_name = drone_names[di]
-        # Find nearest unassigned goal
-        sorted_goals = np.argsort(distances[di])
-        
-        pick = None
-        for g in sorted_goals:
-            if g not in assigned_goals:
-                pick = g
-                break
-        
-        if pick is None:
-            pick = sorted_goals[0]
-        
-        assigned_goals.add(pick)
-        assignments[di] = pick
-        
         drone_pos = drones_xy[di]
         goal_pos = goals_xy[pick]
         dist = distances[di, pick]
-        
+
         print(f"{drone_name} (pos={drone_pos}) -> Goal{pick} (pos={goal_pos}), distance={dist:.3f}m")
     
     # Create visualization
@@ -122,25 +111,31 @@ def plot_assignments(goals_ned: np.ndarray, drone_positions: dict, output_path:
                    xytext=(5, -20), textcoords='offset points', fontsize=11, fontweight='bold',
                    bbox=dict(boxstyle='round,pad=0.4', fc='lightyellow', ec='darkred', linewidth=1.5))
     
-    # Draw assignment arrows with colors
+    # Draw assignment arrows: one LineCollection + one quiver call instead
+    # of N individual ax.arrow patches
     colors = plt.cm.tab10(np.arange(n_drones))
-    for d in range(n_drones):
-        g = assignments[d]
-        ax.arrow(drones_xy[d, 0], drones_xy[d, 1],
-                goals_xy[g, 0] - drones_xy[d, 0],
-                goals_xy[g, 1] - drones_xy[d, 1],
-                head_width=0.2, head_length=0.15, fc=colors[d], ec=colors[d],
-                alpha=0.7, linewidth=2.5, zorder=2)
-        
-        # Add text label on arrow
-        mid_x = (drones_xy[d, 0] + goals_xy[g, 0]) / 2
-        mid_y = (drones_xy[d, 1] + goals_xy[g, 1]) / 2
+    d_idx = np.fromiter(assignments.keys(), dtype=int)
+    g_idx = np.fromiter(assignments.values(), dtype=int)
+    starts = drones_xy[d_idx]
+    ends = goals_xy[g_idx]
+    deltas = ends - starts
+
+    segments = np.stack([starts, ends], axis=1)
+    ax.add_collection(LineCollection(segments, colors=colors[d_idx],
+                                     linewidths=2.5, alpha=0.7, zorder=2))
+    ax.quiver(starts[:, 0], starts[:, 1], deltas[:, 0], deltas[:, 1],
+              color=colors[d_idx], angles='xy', scale_units='xy', scale=1,
+              width=0.004, alpha=0.7, zorder=2)
+
+    # Add text labels at arrow midpoints
+    mids = (starts + ends) / 2
+    for d, g, (mid_x, mid_y) in zip(d_idx, g_idx, mids):
         ax.text(mid_x, mid_y, f'{drone_names[d]}->{g}', fontsize=9,
                bbox=dict(boxstyle='round,pad=0.2', fc='white', alpha=0.8))
     
     ax.set_xlabel('X (East) [m]', fontsize=13, fontweight='bold')
     ax.set_ylabel('Y (North) [m]', fontsize=13, fontweight='bold')
-    ax.set_title('Actual Drone Initial Positions → Goal Assignments\n(Based on Nearest Unique Assignment)',
+    ax.set_title('Actual Drone Initial Positions → Goal Assignments\n(Based on Optimal Hungarian Assignment)',
                 fontsize=14, fontweight='bold')
     ax.grid(True, alpha=0.3, linestyle='--')
     ax.set_aspect('equal')
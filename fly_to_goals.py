@@ -6,9 +6,15 @@ Usage: python fly_to_goals.py <path_to_goals_json>
 
 import sys
 import json
+import logging
+import logging.handlers
 import os
+import queue
 import time
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from scipy.optimize import linear_sum_assignment
+from scipy.spatial.distance import cdist
 from pathlib import Path
 
 # Add repo root to path
@@ -17,6 +23,29 @@ sys.path.insert(0, str(repo_root))
 
 from src.integrated_controller import LLMAirSimSwarmController
 
+logger = logging.getLogger("fly_to_goals")
+
+
+def setup_loop_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    Route loop logging through a background QueueListener thread.
+
+    The control loop only enqueues records (no formatting, no stdout
+    syscalls); the listener thread formats and writes them, so logging
+    never eats into the loop's dt budget.
+
+    Returns:
+        The started QueueListener (call .stop() when done)
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    listener.start()
+    return listener
+
 
 def load_goals(json_path: str) -> dict:
     """
@@ -32,76 +61,83 @@ def load_goals(json_path: str) -> dict:
         return json.load(f)
 
 
-def load_drone_initial_positions(settings_path: str = "settings.json") -> dict:
-    """Load drone initial positions from AirSim settings.json"""
+def load_drone_initial_positions(settings_path: str = "settings.json") -> tuple:
+    """
+    Load drone initial positions from AirSim settings.json
+
+    The parsed arrays are cached in an .npz file keyed by the settings
+    file's mtime, so repeated runs against an unchanged settings.json
+    skip the JSON parse entirely.
+
+    Returns:
+        Tuple of (names, positions): names in canonical numeric order and
+        a contiguous (N, 3) float32 array of positions in the same order
+    """
+    mtime = os.stat(settings_path).st_mtime_ns
+    cache_path = f"{settings_path}.cache.{mtime}.npz"
+
+    if os.path.exists(cache_path):
+        try:
+            with np.load(cache_path) as cached:
+                return list(cached["names"]), cached["positions"]
+        except Exception:
+            pass  # stale/corrupt cache; fall through to a fresh parse
+
     with open(settings_path, 'r', encoding='utf-8') as f:
         settings = json.load(f)
-    
+
     vehicles = settings.get("Vehicles", {})
-    positions = {}
-    
-    for drone_name, config in vehicles.items():
-        x = config.get("X", 0)
-        y = config.get("Y", 0)
-        z = config.get("Z", 0)
-        positions[drone_name] = np.array([float(x), float(y), float(z)])
-    
-    return positions
+    names = sorted(vehicles.keys(), key=lambda x: int(x[5:]))
+    positions = np.array(
+        [[float(vehicles[name].get(axis, 0)) for axis in ("X", "Y", "Z")]
+         for name in names],
+        dtype=np.float32,
+    )
+
+    try:
+        np.savez(cache_path, names=np.array(names), positions=positions)
+    except OSError:
+        pass  # read-only location; caching is best-effort
+
+    return names, positions
 
 
-def assign_nearest_unique(drone_positions: dict, goals_ned: np.ndarray) -> dict:
+def assign_nearest_unique(drone_names: list, drone_positions: np.ndarray,
+                          goals_ned: np.ndarray) -> dict:
     """
     Assign each drone to the nearest unique goal position.
-    
+
     Args:
-        drone_positions: Dict mapping drone_name -> position (3,)
-        goals_ned: Array of shape (N, 3) with goal positions
-        
+        drone_names: Drone names in the same order as drone_positions
+        drone_positions: Contiguous (N, 3) array of current positions
+        goals_ned: Array of shape (M, 3) with goal positions
+
     Returns:
         Dict mapping drone_name -> goal_index
     """
-    drone_names = sorted(drone_positions.keys(), key=lambda x: int(x.replace('Drone', '')))
     n_drones = len(drone_names)
     n_goals = goals_ned.shape[0]
-    
-    # Get drone positions as array
-    drone_pos_array = np.array([drone_positions[name] for name in drone_names])
-    
-    # Compute distance matrix (drones x goals) using XY plane distances
-    dists = np.linalg.norm(drone_pos_array[:, None, :2] - goals_ned[None, :, :2], axis=2)
-    
-    assignments = {}
-    assigned_goals = set()
-    
-    # Order drones by descending minimal distance (farther drones pick first)
-    min_dists = dists.min(axis=1)
-    drone_order = np.argsort(-min_dists)
+
+    # Compute distance matrix (drones x goals) using XY plane distances;
+    # cdist works on the 2D slices directly without the (N, M, 2) broadcast
+    # temporary the norm-of-difference form allocates
+    dists = cdist(drone_positions[:, :2], goals_ned[:, :2])
     
     allow_duplicates = n_goals < n_drones
     if allow_duplicates:
         print(f"⚠ Warning: fewer goal points ({n_goals}) than drones ({n_drones}); some will share targets")
-    
-    for di in drone_order:
-        drone_name = drone_names[di]
-        # Find nearest unassigned goal
-        choices = list(range(n_goals))
-        sorted_goals = sorted(choices, key=lambda g: float(dists[di, g]))
-        
-        pick = None
-        if allow_duplicates:
-            pick = sorted_goals[0]
-        else:
-            for g in sorted_goals:
-                if g not in assigned_goals:
-                    pick = g
-                    break
-            if pick is None:
-                pick = sorted_goals[0]
-        
-        assigned_goals.add(pick)
-        assignments[drone_name] = int(pick)
-    
-    return assignments
+        # Tile the goal columns so every drone can still be matched;
+        # column c maps back to goal c % n_goals
+        reps = -(-n_drones // n_goals)  # ceil division
+        cost = np.tile(dists, (1, reps))[:, :n_drones]
+    else:
+        cost = dists
+
+    # Globally optimal (minimum total distance) pairing in C code,
+    # replacing the former greedy farthest-picks-first Python loop
+    row_ind, col_ind = linear_sum_assignment(cost)
+
+    return {drone_names[r]: int(c % n_goals) for r, c in zip(row_ind, col_ind)}
 
 
 def main():
@@ -129,26 +165,26 @@ def main():
     # Load drone initial positions
     print(f"Loading drone initial positions from settings.json...")
     try:
-        drone_positions = load_drone_initial_positions("settings.json")
+        settings_names, initial_positions = load_drone_initial_positions("settings.json")
     except Exception as e:
         print(f"Error loading settings: {e}")
         sys.exit(1)
     
     # Extract info
     description = goals_data.get("description", "Unknown shape")
-    goals_ned = np.array(goals_data.get("goals_ned", []))
+    # float32 is plenty for cm-level drone accuracy and keeps the whole
+    # control-loop data path at half the memory bandwidth
+    goals_ned = np.asarray(goals_data.get("goals_ned", []), dtype=np.float32)
     scale = goals_data.get("scale", 1.0)
     altitude = goals_data.get("flight_altitude", 5.0)
     
     # Force 10 drones
     num_points = 5
     
-    # If fewer than 10 goal points, repeat them cyclically
-    if len(goals_ned) < num_points:
-        repeat_count = (num_points // len(goals_ned)) + 1
-        goals_ned = np.vstack([goals_ned] * repeat_count)[:num_points]
-    elif len(goals_ned) > num_points:
-        goals_ned = goals_ned[:num_points]
+    # Repeat or truncate goals cyclically to match the drone count; the
+    # modulo gather copies exactly num_points rows in a single allocation
+    if len(goals_ned) != num_points:
+        goals_ned = goals_ned[np.arange(num_points) % len(goals_ned)]
     
     print(f"Description: {description}")
     print(f"Number of drones: {num_points}")
@@ -180,7 +216,9 @@ def main():
     print("\n" + "="*60)
     print("Starting formation flight mission (all drones simultaneous)...")
     print("="*60 + "\n")
-    
+
+    log_listener = setup_loop_logging()
+
     try:
         drone_list = list(controller.swarm.drones.keys())
         n_drones = len(drone_list)
@@ -200,18 +238,24 @@ def main():
         # Step 3: APF-based formation flight to goals
         print("\nStep 3: Computing optimal goal assignments (based on initial positions)...")
         
-        # Compute assignments using nearest unique algorithm
-        assignments = assign_nearest_unique(drone_positions, goals_ned)
+        # Compute assignments using nearest unique algorithm; the loader
+        # already returns names in canonical numeric order
+        assignments = assign_nearest_unique(settings_names, initial_positions,
+                                            goals_ned)
+        name_to_idx = {name: i for i, name in enumerate(settings_names)}
         
         # Build ordered assigned goals array matching swarm drone order
-        assigned_goals = np.zeros((n_drones, 3), dtype=float)
+        assigned_goals = np.zeros((n_drones, 3), dtype=np.float32)
         
         print(f"Task assignments:")
         for i, drone_name in enumerate(drone_list):
             goal_idx = assignments.get(drone_name, i)
             assigned_goals[i] = goals_ned[int(goal_idx)]
             goal = assigned_goals[i]
-            init_pos = drone_positions.get(drone_name, [0, 0, 0])
+            if drone_name in name_to_idx:
+                init_pos = initial_positions[name_to_idx[drone_name]]
+            else:
+                init_pos = np.zeros(3, dtype=np.float32)
             dist = np.linalg.norm(goal[:2] - init_pos[:2])
             print(f"  {drone_name} (init={tuple(init_pos[:2].round(2))}) -> Goal[{goal_idx}] (pos={tuple(goal[:2].round(2))}) distance={dist:.2f}m")
         
@@ -222,59 +266,94 @@ def main():
         
         # Control loop
         arrival_thresh = 0.5  # meters
+        arrival_thresh_sq = arrival_thresh * arrival_thresh
         dt = 0.5
         max_time = 120.0
-        t_start = time.time()
+        # Deadline-based scheduling on the monotonic clock: the tick period
+        # stays dt regardless of how long APF/logging took this iteration
+        next_tick = time.perf_counter()
+        deadline = next_tick + max_time
         
+        # Preallocate loop buffers once; each iteration fills them in place
+        current_positions = np.zeros((n_drones, 3), dtype=np.float32)
+        diff_buf = np.empty_like(current_positions)
+        sq_dists = np.empty(n_drones, dtype=np.float32)
+
+        # Pipeline the two AirSim RPCs with the APF compute: the position
+        # poll and the previous velocity command go out together, and the
+        # APF step runs while the command is still in flight. send_vels is
+        # owned by the RPC thread until its future resolves.
+        rpc_pool = ThreadPoolExecutor(max_workers=2)
+        send_vels = np.zeros((n_drones, 3), dtype=np.float32)
+        have_command = False
+
         iteration = 0
         while True:
             iteration += 1
-            
-            # Update current positions
-            current_positions = controller.swarm.get_positions()
-            if current_positions.shape[0] != n_drones:
-                padded = np.zeros((n_drones, 3), dtype=float)
-                padded[: current_positions.shape[0], :] = current_positions
-                current_positions = padded
-            
+
+            # Dispatch both RPCs concurrently
+            fut_get = rpc_pool.submit(controller.swarm.get_positions)
+            fut_set = (rpc_pool.submit(controller.swarm.set_velocities,
+                                       send_vels, duration=dt)
+                       if have_command else None)
+
+            # Update current positions (copy into the reused buffer)
+            polled = fut_get.result()
+            m = min(polled.shape[0], n_drones)
+            current_positions[:m] = polled[:m]
+
             # Compute APF control
             controller.apf_controller.goals = assigned_goals
             vels = controller.apf_controller.get_control(current_positions)
-            
-            # Clip velocities
+
+            # Clip velocities (branchless: scale is 1.0 for in-limit rows)
             speeds = np.linalg.norm(vels, axis=1)
-            too_fast = speeds > controller.apf_controller.max_vel
-            if np.any(too_fast):
-                vels[too_fast] = (
-                    vels[too_fast] / speeds[too_fast, None] * controller.apf_controller.max_vel
-                )
-            
-            # Send velocity commands
-            controller.swarm.set_velocities(vels, duration=dt)
-            
-            # Check arrival
-            dists = np.linalg.norm(current_positions - assigned_goals, axis=1)
-            arrived = np.sum(dists <= arrival_thresh)
-            
+            scale = np.minimum(1.0, controller.apf_controller.max_vel / np.maximum(speeds, 1e-9))
+            vels *= scale[:, None]
+
+            # Stage the command for the next dispatch; wait for the
+            # in-flight one first so its buffer is safe to overwrite
+            if fut_set is not None:
+                fut_set.result()
+            send_vels[:] = vels
+            have_command = True
+
+            # Check arrival on squared distance: the threshold compare
+            # doesn't need the sqrt, so it only happens when logging
+            np.subtract(current_positions, assigned_goals, out=diff_buf)
+            np.einsum('ij,ij->i', diff_buf, diff_buf, out=sq_dists)
+            arrived = np.sum(sq_dists <= arrival_thresh_sq)
+
             if iteration % 10 == 0:  # Log every 5 seconds
-                print(f"  Iter {iteration}: {arrived}/{n_drones} drones within range, avg dist: {dists.mean():.2f}m")
-                # Detailed position vs goal tracking
-                for i, drone_name in enumerate(drone_list):
-                    pos = current_positions[i]
-                    goal = assigned_goals[i]
-                    dist_to_goal = dists[i]
-                    print(f"    {drone_name}: pos=({pos[0]:6.2f},{pos[1]:6.2f}) -> goal=({goal[0]:6.2f},{goal[1]:6.2f}) dist={dist_to_goal:.2f}m")
-            
-            if np.all(dists <= arrival_thresh):
+                # Lazy %-formatting + queue handler: the loop only enqueues
+                # the record; the listener thread formats and writes it
+                dists = np.sqrt(sq_dists)
+                logger.info("  Iter %d: %d/%d drones within range, avg dist: %.2fm",
+                            iteration, arrived, n_drones, dists.mean())
+                # One record for the whole swarm instead of N print calls
+                logger.debug("positions=%s goals=%s dists=%s",
+                             current_positions, assigned_goals, dists)
+
+            if np.all(sq_dists <= arrival_thresh_sq):
                 print(f"✓ All drones within arrival threshold!")
                 break
             
-            if time.time() - t_start > max_time:
+            now = time.perf_counter()
+            if now > deadline:
                 print(f"⚠ Timeout: moving to finalization after {max_time}s")
                 break
-            
-            time.sleep(dt)
-        
+
+            # Sleep only for the remainder of this tick; if we're already
+            # past the deadline, re-anchor instead of racing to catch up
+            next_tick += dt
+            sleep = next_tick - now
+            if sleep > 0:
+                time.sleep(sleep)
+            else:
+                next_tick = now
+
+        rpc_pool.shutdown(wait=True)
+
         # Step 4: Hovering at target points
         print("\nStep 4: All drones hovering at target positions...")
         print("Press Enter to begin landing sequence...")
@@ -316,7 +395,9 @@ def main():
             controller.swarm.disarm_all()
         except Exception as e2:
             print(f"Warning: Error during emergency landing: {e2}")
-    
+    finally:
+        log_listener.stop()
+
     print("\nMission complete!")
 
 
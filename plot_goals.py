@@ -7,6 +7,7 @@ import sys
 import json
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 from pathlib import Path
 
 
@@ -48,23 +49,35 @@ def plot_goals(goals_ned: np.ndarray, description: str, output_path: str = None)
     # Plot points
     ax.scatter(x, y, s=200, c='red', marker='o', zorder=3, label='Drone Goals')
     
-    # Plot line connecting points (to show shape)
-    # Close the loop by adding first point at the end
-    x_loop = np.append(x, x[0])
-    y_loop = np.append(y, y[0])
-    ax.plot(x_loop, y_loop, 'b--', linewidth=2, alpha=0.5, label='Shape outline')
-    
-    # Annotate points with index
-    for i, (xi, yi) in enumerate(zip(x, y)):
-        ax.annotate(
-            f'Drone{i+1}\n({xi:.2f}, {yi:.2f})',
-            xy=(xi, yi),
-            xytext=(10, 10),
-            textcoords='offset points',
-            fontsize=10,
-            bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.7),
-            arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0')
-        )
+    # Plot line connecting points (to show shape) as one batched
+    # collection; rolling the endpoints by -1 closes the loop without
+    # building appended copies of the coordinate arrays
+    segs = np.stack([
+        np.column_stack([x, y]),
+        np.column_stack([np.roll(x, -1), np.roll(y, -1)]),
+    ], axis=1)
+    ax.add_collection(LineCollection(segs, linestyles='--', colors='b',
+                                     alpha=0.5, linewidths=2,
+                                     label='Shape outline'))
+    
+    # Annotate points with index. The full annotation (bbox + arrow)
+    # builds a FancyArrowPatch per point and dominates plot time for big
+    # swarms, so past 20 points fall back to bare index labels.
+    if len(x) <= 20:
+        for i, (xi, yi) in enumerate(zip(x, y)):
+            ax.annotate(
+                f'Drone{i+1}\n({xi:.2f}, {yi:.2f})',
+                xy=(xi, yi),
+                xytext=(10, 10),
+                textcoords='offset points',
+                fontsize=10,
+                bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.7),
+                arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0')
+            )
+    else:
+        for i, (xi, yi) in enumerate(zip(x, y)):
+            ax.text(xi, yi, str(i + 1), fontsize=8, zorder=4,
+                    ha='center', va='center')
     
     # Set labels and title
     ax.set_xlabel('X (East)', fontsize=12)
@@ -78,12 +91,12 @@ def plot_goals(goals_ned: np.ndarray, description: str, output_path: str = None)
     # Add legend
     ax.legend(loc='upper right', fontsize=10)
     
-    # Calculate and display statistics
-    center_x = np.mean(x)
-    center_y = np.mean(y)
-    distances = np.linalg.norm(goals_ned[:, :2] - np.array([center_x, center_y]), axis=1)
-    
-    stats_text = f"Center: ({center_x:.2f}, {center_y:.2f})\n"
+    # Calculate and display statistics (one centered array, one reduction)
+    xy = goals_ned[:, :2]
+    center = xy.mean(axis=0)
+    distances = np.sqrt(((xy - center) ** 2).sum(axis=1))
+
+    stats_text = f"Center: ({center[0]:.2f}, {center[1]:.2f})\n"
     stats_text += f"Radius range: [{distances.min():.2f}, {distances.max():.2f}]\n"
     stats_text += f"Num points: {len(x)}"
     
@@ -4,11 +4,20 @@ Quick start script for LLM AirSim Swarm Controller
 Run this script to get started quickly
 """
 
+import importlib.util
 import os
 import sys
 import argparse
+import functools
+import types
 from pathlib import Path
 
+# Snapshot the API keys once at import; every check reads the same
+# frozen view instead of re-querying the environment
+_ENV = types.MappingProxyType({
+    k: os.environ.get(k, "") for k in ("OPENAI_API_KEY",)
+})
+
 
 def setup_environment():
     """Setup Python path and environment"""
@@ -32,23 +41,32 @@ def check_dependencies():
         "airsim",
     ]
     
-    print("\nChecking dependencies...")
+    # Buffer the report and emit it with one write instead of a
+    # flushing print per package
+    lines = ["\nChecking dependencies..."]
     missing = []
-    
+
     for package in required_packages:
+        # find_spec only walks the finder chain — no module code runs, so
+        # the check stays fast even for heavy packages like scipy/sklearn
         try:
-            __import__(package)
-            print(f"  ✓ {package}")
-        except ImportError:
-            print(f"  ✗ {package} (NOT INSTALLED)")
+            spec = importlib.util.find_spec(package)
+        except (ValueError, ModuleNotFoundError):
+            spec = None
+        if spec is not None:
+            lines.append(f"  ✓ {package}")
+        else:
+            lines.append(f"  ✗ {package} (NOT INSTALLED)")
             missing.append(package)
-    
+
     if missing:
-        print(f"\nMissing packages: {', '.join(missing)}")
-        print("Install with: pip install -r requirements.txt")
+        lines.append(f"\nMissing packages: {', '.join(missing)}")
+        lines.append("Install with: pip install -r requirements.txt")
+        print("\n".join(lines))
         return False
-    
-    print("\n✓ All dependencies satisfied")
+
+    lines.append("\n✓ All dependencies satisfied")
+    print("\n".join(lines))
     return True
 
 
@@ -56,7 +74,7 @@ def check_api_keys():
     """Check if API keys are configured"""
     print("\nChecking API configuration...")
     
-    api_key = os.getenv("OPENAI_API_KEY", "")
+    api_key = _ENV["OPENAI_API_KEY"]
     if api_key:
         print(f"  ✓ OPENAI_API_KEY configured")
     else:
@@ -172,25 +190,20 @@ def run_example(example_num):
     print(f"Running Example {example_num}")
     print("="*70 + "\n")
     
+    examples = {
+        1: "example_basic_usage",
+        2: "example_multiple_shapes",
+        3: "example_custom_parameters",
+        4: "example_shape_descriptions",
+        5: "example_error_handling",
+    }
+
     try:
-        from examples import (
-            example_basic_usage,
-            example_multiple_shapes,
-            example_custom_parameters,
-            example_shape_descriptions,
-            example_error_handling,
-        )
-        
-        examples = {
-            1: ("Basic Usage", example_basic_usage),
-            2: ("Multiple Shapes", example_multiple_shapes),
-            3: ("Custom Parameters", example_custom_parameters),
-            4: ("Shape Descriptions", example_shape_descriptions),
-            5: ("Error Handling", example_error_handling),
-        }
-        
         if example_num in examples:
-            name, func = examples[example_num]
+            # Resolve just the requested example by name; the dispatch
+            # table stays import-free so bad -e values fail fast
+            mod = importlib.import_module("examples")
+            func = getattr(mod, examples[example_num])
             func()
         else:
             print(f"Example {example_num} not found")
@@ -201,39 +214,45 @@ def run_example(example_num):
         traceback.print_exc()
 
 
-def main():
-    """Main entry point"""
+@functools.cache
+def _parser() -> argparse.ArgumentParser:
+    """Build the argument parser once per process"""
     parser = argparse.ArgumentParser(
         description="LLM AirSim Swarm Controller Quick Start"
     )
-    
+
     parser.add_argument(
         "--check",
         action="store_true",
         help="Check dependencies and configuration"
     )
-    
+
     parser.add_argument(
         "--test",
         action="store_true",
         help="Test LLM and AirSim connections"
     )
-    
+
     parser.add_argument(
         "--interactive",
         "-i",
         action="store_true",
         help="Run in interactive mode"
     )
-    
+
     parser.add_argument(
         "--example",
         "-e",
         type=int,
         help="Run a specific example (1-5)"
     )
-    
-    args = parser.parse_args()
+
+    return parser
+
+
+def main():
+    """Main entry point"""
+    args = _parser().parse_args()
     
     # Setup
     setup_environment()
@@ -3,41 +3,55 @@
 Quick guide to using RAG system with LLM AirSim Swarm Controller
 """
 
+import argparse
+import importlib.util
 import os
 import sys
+from pathlib import Path
 
 
-def main():
-    print("="*70)
-    print("RAG System Quick Start Guide")
-    print("="*70)
-    
+def setup_environment():
+    """Put the src package on the path so the RAG modules resolve"""
+    current_dir = Path(__file__).parent
+    src_dir = current_dir / "src"
+    sys.path.insert(0, str(current_dir))
+    if src_dir.exists():
+        sys.path.insert(0, str(src_dir))
+
+
+def build_guide():
+    """Assemble the static guide text as a list of lines"""
+    lines = []
+    lines.append("="*70)
+    lines.append("RAG System Quick Start Guide")
+    lines.append("="*70)
+
     # Check environment
-    print("\n1. Environment Setup:")
-    print("-" * 70)
-    
+    lines.append("\n1. Environment Setup:")
+    lines.append("-" * 70)
+
     dashscope_key = os.getenv("DASHSCOPE_API_KEY")
     openai_key = os.getenv("OPENAI_API_KEY")
     openai_base = os.getenv("OPENAI_BASE_URL")
     llm_model = os.getenv("LLM_MODEL")
-    
+
     if dashscope_key:
-        print("  ✓ DASHSCOPE_API_KEY configured (for Qwen embedding)")
+        lines.append("  ✓ DASHSCOPE_API_KEY configured (for Qwen embedding)")
     else:
-        print("  ⚠ DASHSCOPE_API_KEY not set")
-        print("    Set with: $env:DASHSCOPE_API_KEY = 'sk-xxx'")
-    
+        lines.append("  ⚠ DASHSCOPE_API_KEY not set")
+        lines.append("    Set with: $env:DASHSCOPE_API_KEY = 'sk-xxx'")
+
     if openai_key and openai_base and llm_model:
-        print("  ✓ OpenAI API configured (for LLM)")
+        lines.append("  ✓ OpenAI API configured (for LLM)")
     else:
-        print("  ⚠ OpenAI API not fully configured")
-        print("    Set OPENAI_API_KEY, OPENAI_BASE_URL, LLM_MODEL")
-    
+        lines.append("  ⚠ OpenAI API not fully configured")
+        lines.append("    Set OPENAI_API_KEY, OPENAI_BASE_URL, LLM_MODEL")
+
     # Usage examples
-    print("\n2. Usage Examples:")
-    print("-" * 70)
-    
-    print("""
+    lines.append("\n2. Usage Examples:")
+    lines.append("-" * 70)
+
+    lines.append("""
 Example 1: Use RAG system directly
 ---
 from rag_system import QwenEmbedding, KnowledgeBase
@@ -77,58 +91,82 @@ Example 4: Run all examples
 python rag_examples.py
 ---
     """)
-    
+
     # Key features
-    print("\n3. Key Features:")
-    print("-" * 70)
-    print("""
+    lines.append("\n3. Key Features:")
+    lines.append("-" * 70)
+    lines.append("""
   • Qwen Embedding Integration
     - Uses text-embedding-v4 model from DashScope
     - 1536-dimensional vectors
     - Automatic caching for efficiency
-  
+
   • Knowledge Retrieval
     - Vector similarity search
     - Top-K document retrieval
     - Metadata tracking
-  
+
   • Automatic Enhancement
     - RAG-enhanced chat
     - RAG-enhanced SDF generation
     - Seamless integration with existing controller
-  
+
   • Persistence
     - Cache knowledge bases to disk
     - Load pre-computed embeddings
     - Avoid re-embedding costs
     """)
-    
+
     # Next steps
-    print("\n4. Next Steps:")
-    print("-" * 70)
-    print("""
+    lines.append("\n4. Next Steps:")
+    lines.append("-" * 70)
+    lines.append("""
   1. Set DASHSCOPE_API_KEY environment variable
   2. (Optional) Set OPENAI_API_KEY for LLM enhancement
   3. Run: python rag_examples.py
   4. Integrate with your application:
-     
+
      from rag_integration import create_rag_enhanced_controller
      controller = create_rag_enhanced_controller(drone_names)
      controller.prepare_mission("Your task description")
     """)
-    
-    # Testing
-    print("\n5. Testing RAG System:")
-    print("-" * 70)
-    
+
+    return lines
+
+
+def check_modules():
+    """Verify the RAG modules are resolvable without importing them
+
+    find_spec only walks the finder chain — numpy and the embedding SDK
+    stay unloaded, so reading the guide stays fast.
+    """
+    lines = ["\nChecking module availability..."]
+    ok = True
+    for module in ("rag_system", "rag_integration", "rag_examples"):
+        try:
+            spec = importlib.util.find_spec(module)
+        except (ValueError, ModuleNotFoundError):
+            spec = None
+        if spec is not None:
+            lines.append(f"  ✓ {module}.py found")
+        else:
+            lines.append(f"  ✗ {module}.py not found")
+            ok = False
+    if ok:
+        lines.append("\n✓ All RAG modules available (run with --test to import them)")
+    return ok, lines
+
+
+def test_imports():
+    """Actually import the RAG stack (pulls in numpy and the SDK)"""
+    lines = ["\nTesting imports..."]
     try:
-        print("\nTesting imports...")
         from rag_system import QwenEmbedding, KnowledgeBase
-        print("  ✓ rag_system.py imported")
-        
+        lines.append("  ✓ rag_system.py imported")
+
         from rag_integration import RAGEnhancedLLMClient
-        print("  ✓ rag_integration.py imported")
-        
+        lines.append("  ✓ rag_integration.py imported")
+
         from rag_examples import (
             example_1_basic_rag,
             example_2_rag_enhanced_llm,
@@ -136,20 +174,46 @@ python rag_examples.py
             example_4_rag_controller,
             example_5_load_custom_knowledge
         )
-        print("  ✓ rag_examples.py imported")
-        
-        print("\n✓ All RAG modules loaded successfully!")
-        
+        lines.append("  ✓ rag_examples.py imported")
+
+        lines.append("\n✓ All RAG modules loaded successfully!")
+        return True, lines
+
     except ImportError as e:
-        print(f"  ✗ Import error: {e}")
-        return 1
-    
-    # Documentation
-    print("\n6. Documentation:")
-    print("-" * 70)
-    print("""
+        lines.append(f"  ✗ Import error: {e}")
+        return False, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RAG System Quick Start Guide")
+    parser.add_argument(
+        "--test",
+        action="store_true",
+        help="Import the RAG modules to verify the installation"
+    )
+    args = parser.parse_args()
+
+    setup_environment()
+
+    lines = build_guide()
+
+    # Testing — availability check by default, real imports behind --test
+    lines.append("\n5. Testing RAG System:")
+    lines.append("-" * 70)
+
+    if args.test:
+        ok, test_lines = test_imports()
+    else:
+        ok, test_lines = check_modules()
+    lines.extend(test_lines)
+
+    if ok:
+        # Documentation
+        lines.append("\n6. Documentation:")
+        lines.append("-" * 70)
+        lines.append("""
   Main documentation: RAG_README.md
-  
+
   Quick reference:
   - QwenEmbedding: Qwen embedding wrapper
   - KnowledgeBase: Vector database for documents
@@ -157,12 +221,15 @@ python rag_examples.py
   - RAGEnhancedLLMClient: Integrated with existing LLM client
   - create_rag_enhanced_controller: Factory function for controller
     """)
-    
-    print("\n" + "="*70)
-    print("RAG System Ready!")
-    print("="*70)
-    
-    return 0
+
+        lines.append("\n" + "="*70)
+        lines.append("RAG System Ready!")
+        lines.append("="*70)
+
+    # One buffered write instead of a flushing print per section
+    sys.stdout.write("\n".join(lines) + "\n")
+
+    return 0 if ok else 1
 
 
 if __name__ == "__main__":
@@ -0,0 +1,143 @@
+"""
+Numba-compiled kernels for the circle/sphere verification scripts.
+
+The fits are tiny normal-equation solves where Python/NumPy dispatch
+overhead dominates for small point sets; these @njit versions accumulate
+AtA/Atb with explicit (fully unrollable) loops and solve the 3x3/4x4
+system in compiled code. cache=True persists the compiled functions so
+repeat script runs skip the JIT.
+
+verify_circle.py / verify_sphere.py import this module optionally and
+fall back to their NumPy implementations when numba is unavailable or a
+system is singular.
+"""
+
+import numpy as np
+import numba
+
+
+@numba.njit(cache=True, fastmath=True)
+def fit_plane(points):
+    # returns centroid, normal, basis_u, basis_v
+    n = points.shape[0]
+    centroid = np.zeros(3)
+    for i in range(n):
+        for k in range(3):
+            centroid[k] += points[i, k]
+    for k in range(3):
+        centroid[k] /= n
+
+    # 3x3 covariance of the centered cloud
+    C = np.zeros((3, 3))
+    for i in range(n):
+        dx = points[i, 0] - centroid[0]
+        dy = points[i, 1] - centroid[1]
+        dz = points[i, 2] - centroid[2]
+        C[0, 0] += dx * dx
+        C[0, 1] += dx * dy
+        C[0, 2] += dx * dz
+        C[1, 1] += dy * dy
+        C[1, 2] += dy * dz
+        C[2, 2] += dz * dz
+    C[1, 0] = C[0, 1]
+    C[2, 0] = C[0, 2]
+    C[2, 1] = C[1, 2]
+
+    w, V = np.linalg.eigh(C)
+    normal = V[:, 0].copy()
+    basis_u = V[:, 2].copy()
+    basis_v = np.cross(normal, basis_u)
+    return centroid, normal, basis_u, basis_v
+
+
+@numba.njit(cache=True, fastmath=True)
+def fit_circle_2d(xy):
+    # Solve (xi^2+yi^2) = 2a xi + 2b yi + c via the 3x3 normal equations
+    n = xy.shape[0]
+    AtA = np.zeros((3, 3))
+    Atb = np.zeros(3)
+    for i in range(n):
+        a0 = 2.0 * xy[i, 0]
+        a1 = 2.0 * xy[i, 1]
+        bi = xy[i, 0] * xy[i, 0] + xy[i, 1] * xy[i, 1]
+        AtA[0, 0] += a0 * a0
+        AtA[0, 1] += a0 * a1
+        AtA[0, 2] += a0
+        AtA[1, 1] += a1 * a1
+        AtA[1, 2] += a1
+        AtA[2, 2] += 1.0
+        Atb[0] += a0 * bi
+        Atb[1] += a1 * bi
+        Atb[2] += bi
+    AtA[1, 0] = AtA[0, 1]
+    AtA[2, 0] = AtA[0, 2]
+    AtA[2, 1] = AtA[1, 2]
+
+    sol = np.linalg.solve(AtA, Atb)
+    a, b_par, c = sol[0], sol[1], sol[2]
+    r2 = a * a + b_par * b_par + c
+    radius = np.sqrt(r2) if r2 > 0.0 else 0.0
+
+    center = np.empty(2)
+    center[0] = a
+    center[1] = b_par
+    dists = np.empty(n)
+    residuals = np.empty(n)
+    for i in range(n):
+        d = np.hypot(xy[i, 0] - a, xy[i, 1] - b_par)
+        dists[i] = d
+        residuals[i] = abs(d - radius)
+    return center, radius, residuals, dists
+
+
+@numba.njit(cache=True, fastmath=True)
+def fit_sphere(points):
+    # Solve (x^2+y^2+z^2) = 2*cx*x + 2*cy*y + 2*cz*z + c via the 4x4
+    # normal equations
+    n = points.shape[0]
+    AtA = np.zeros((4, 4))
+    Atb = np.zeros(4)
+    for i in range(n):
+        a0 = 2.0 * points[i, 0]
+        a1 = 2.0 * points[i, 1]
+        a2 = 2.0 * points[i, 2]
+        bi = (points[i, 0] * points[i, 0]
+              + points[i, 1] * points[i, 1]
+              + points[i, 2] * points[i, 2])
+        AtA[0, 0] += a0 * a0
+        AtA[0, 1] += a0 * a1
+        AtA[0, 2] += a0 * a2
+        AtA[0, 3] += a0
+        AtA[1, 1] += a1 * a1
+        AtA[1, 2] += a1 * a2
+        AtA[1, 3] += a1
+        AtA[2, 2] += a2 * a2
+        AtA[2, 3] += a2
+        AtA[3, 3] += 1.0
+        Atb[0] += a0 * bi
+        Atb[1] += a1 * bi
+        Atb[2] += a2 * bi
+        Atb[3] += bi
+    for r in range(1, 4):
+        for col in range(r):
+            AtA[r, col] = AtA[col, r]
+
+    sol = np.linalg.solve(AtA, Atb)
+    cx, cy, cz, c = sol[0], sol[1], sol[2], sol[3]
+    r2 = cx * cx + cy * cy + cz * cz + c
+    radius = np.sqrt(r2) if r2 > 0.0 else 0.0
+
+    center = np.empty(3)
+    center[0] = cx
+    center[1] = cy
+    center[2] = cz
+    dists = np.empty(n)
+    residuals = np.empty(n)
+    for i in range(n):
+        dx = points[i, 0] - cx
+        dy = points[i, 1] - cy
+        dz = points[i, 2] - cz
+        d = np.sqrt(dx * dx + dy * dy + dz * dz)
+        dists[i] = d
+        residuals[i] = abs(d - radius)
+    return center, radius, residuals, dists
@@ -20,26 +20,47 @@ import os
 import argparse
 import numpy as np
 
+try:
+    import _fit_numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 def load_goals(path):
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    pts = np.array(data.get("goals_ned", []), dtype=float)
+    # orjson parses large goal lists several times faster than stdlib
+    if ORJSON_AVAILABLE:
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    pts = np.asarray(data.get("goals_ned", []), dtype=float)
     return pts, data
 
 
 def fit_plane(points):
     # returns centroid, normal, basis_u, basis_v
+    if NUMBA_AVAILABLE:
+        return _fit_numba.fit_plane(
+            np.ascontiguousarray(points, dtype=np.float64))
     centroid = points.mean(axis=0)
     X = points - centroid
-    u, s, vh = np.linalg.svd(X, full_matrices=False)
-    normal = vh[-1]
-    # choose first basis vector in plane
-    basis_u = vh[0]
+    # eigendecomposition of the 3x3 covariance gives the same principal
+    # axes as SVD of X without the N-dependent LAPACK call; eigh sorts
+    # eigenvalues ascending and returns orthonormal vectors
+    C = X.T @ X
+    w, V = np.linalg.eigh(C)
+    normal = V[:, 0]
+    # choose in-plane basis along the largest-variance axis
+    basis_u = V[:, 2]
     basis_v = np.cross(normal, basis_u)
-    # normalize
-    basis_u = basis_u / np.linalg.norm(basis_u)
-    basis_v = basis_v / np.linalg.norm(basis_v)
     return centroid, normal, basis_u, basis_v
 
 
@@ -52,17 +73,35 @@ def project_to_plane(points, centroid, basis_u, basis_v):
 
 def fit_circle_2d(xy):
     # Solve (xi^2+yi^2) = 2a xi + 2b yi + c
+    if NUMBA_AVAILABLE:
+        try:
+            return _fit_numba.fit_circle_2d(
+                np.ascontiguousarray(xy, dtype=np.float64))
+        except Exception:
+            pass  # singular system — use the conditioned NumPy path
     x = xy[:, 0]
     y = xy[:, 1]
-    A = np.column_stack([2 * x, 2 * y, np.ones_like(x)])
+    A = np.empty((x.shape[0], 3))
+    np.multiply(x, 2.0, out=A[:, 0])
+    np.multiply(y, 2.0, out=A[:, 1])
+    A[:, 2] = 1.0
     b = x * x + y * y
-    sol, *_ = np.linalg.lstsq(A, b, rcond=None)
+    # 3 unknowns — the 3x3 normal equations beat lstsq's SVD; fall back
+    # to lstsq only when the system is ill-conditioned
+    AtA = A.T @ A
+    Atb = A.T @ b
+    if np.linalg.cond(AtA) > 1e12:
+        sol, *_ = np.linalg.lstsq(A, b, rcond=None)
+    else:
+        sol = np.linalg.solve(AtA, Atb)
     a, b_par, c = sol
     center = np.array([a, b_par])
     radius = np.sqrt(max(0.0, a * a + b_par * b_par + c))
-    # residuals
-    dists = np.sqrt((x - a) ** 2 + (y - b_par) ** 2)
-    residuals = np.abs(dists - radius)
+    # residuals — hypot runs one C loop with no intermediate squared
+    # arrays, and abs reuses the subtraction's buffer in place
+    dists = np.hypot(x - a, y - b_par)
+    residuals = dists - radius
+    np.abs(residuals, out=residuals)
     return center, radius, residuals, dists
 
 
@@ -0,0 +1,97 @@
+"""
+Verify a set of 3D points against both shape hypotheses in one pass.
+
+Usage:
+    python scripts/verify_shape.py PATH_TO_JSON
+
+Default file: outputs/goals_10_20260111_230221.json
+
+Running verify_circle.py and verify_sphere.py separately reads and
+parses the goals file twice and rebuilds the point array for each
+script. This driver:
+ - loads the JSON once (shared with both fits)
+ - runs the circle pipeline (plane fit + 2D circle fit) and the sphere
+   fit on the same array
+ - prints both verdicts plus a classification of the better hypothesis
+ - saves combined results to <input>_shape_check.json
+"""
+
+import json
+import os
+import argparse
+
+import verify_circle
+import verify_sphere
+
+
+def evaluate(points3d, data=None, verbose=True):
+    """Run both shape fits on one point array
+
+    Returns:
+        Dict with 'circle' and 'sphere' entries ({'verdict', 'metrics'}
+        or {'error'}) and a 'classification' string
+    """
+    results = {}
+
+    for name, module in (("circle", verify_circle), ("sphere", verify_sphere)):
+        try:
+            verdict, metrics = module.evaluate(points3d, data, verbose=verbose)
+            results[name] = {"verdict": bool(verdict), "metrics": metrics}
+        except Exception as e:
+            if verbose:
+                print(f"Could not evaluate {name} fit: {e}")
+            results[name] = {"error": str(e)}
+
+    # Classify by verdicts first, then by radius-relative RMS residual
+    def rel_rms(name):
+        entry = results[name]
+        if "metrics" not in entry:
+            return float("inf")
+        m = entry["metrics"]
+        return m["residuals_rms"] / max(1e-6, m["radius"])
+
+    passed = [n for n in ("circle", "sphere") if results[n].get("verdict")]
+    if len(passed) == 1:
+        classification = passed[0]
+    elif passed:
+        classification = min(passed, key=rel_rms)
+    else:
+        classification = "neither"
+    results["classification"] = classification
+
+    if verbose:
+        print("\n" + "=" * 70)
+        print(f"Classification: {classification}")
+        print("=" * 70)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?", default=os.path.join("outputs", "goals_10_20260111_230221.json"),
+                        help="Path to goals JSON file")
+
+    args = parser.parse_args()
+
+    # One read/parse shared by both fits
+    pts, data = verify_circle.load_goals(args.path)
+    if pts.size == 0:
+        print("No points found in JSON 'goals_ned'")
+        return 2
+
+    results = evaluate(pts, data)
+
+    out_path = os.path.splitext(args.path)[0] + "_shape_check.json"
+    try:
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"Saved results to {out_path}")
+    except Exception as e:
+        print(f"Could not save results: {e}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
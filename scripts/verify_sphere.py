@@ -19,28 +19,65 @@ import os
 import argparse
 import numpy as np
 
+try:
+    import _fit_numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 def load_goals(path):
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    pts = np.array(data.get("goals_ned", []), dtype=float)
+    # orjson parses large goal lists several times faster than stdlib
+    if ORJSON_AVAILABLE:
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    pts = np.asarray(data.get("goals_ned", []), dtype=float)
     return pts, data
 
 
 def fit_sphere(points):
     # Solve for center (cx,cy,cz) and c where
     # (x^2+y^2+z^2) = 2*cx*x + 2*cy*y + 2*cz*z + c
+    if NUMBA_AVAILABLE:
+        try:
+            return _fit_numba.fit_sphere(
+                np.ascontiguousarray(points, dtype=np.float64))
+        except Exception:
+            pass  # singular system — use the conditioned NumPy path
     x = points[:, 0]
     y = points[:, 1]
     z = points[:, 2]
-    A = np.column_stack([2 * x, 2 * y, 2 * z, np.ones_like(x)])
+    A = np.empty((x.shape[0], 4))
+    np.multiply(x, 2.0, out=A[:, 0])
+    np.multiply(y, 2.0, out=A[:, 1])
+    np.multiply(z, 2.0, out=A[:, 2])
+    A[:, 3] = 1.0
     b = x * x + y * y + z * z
-    sol, *_ = np.linalg.lstsq(A, b, rcond=None)
+    # 4 unknowns — the 4x4 normal equations beat lstsq's SVD; fall back
+    # to lstsq only when the system is ill-conditioned
+    AtA = A.T @ A
+    Atb = A.T @ b
+    if np.linalg.cond(AtA) > 1e12:
+        sol, *_ = np.linalg.lstsq(A, b, rcond=None)
+    else:
+        sol = np.linalg.solve(AtA, Atb)
     cx, cy, cz, c = sol
     center = np.array([cx, cy, cz])
     radius = np.sqrt(max(0.0, cx * cx + cy * cy + cz * cz + c))
-    dists = np.sqrt((x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2)
-    residuals = np.abs(dists - radius)
+    # norm over a single pre-subtracted buffer avoids the per-axis
+    # squared temporaries; abs reuses the subtraction's buffer in place
+    dists = np.linalg.norm(points - center, axis=1)
+    residuals = dists - radius
+    np.abs(residuals, out=residuals)
     return center, radius, residuals, dists
 
 
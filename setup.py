@@ -0,0 +1,24 @@
+"""
+Builds the optional compiled APF kernel:
+
+    python setup.py build_ext --inplace
+
+The package works without it (falling back to the Numba JIT kernel, then
+plain NumPy), but the compiled extension avoids JIT cold-start entirely.
+"""
+
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+extensions = [
+    Extension(
+        "src.apf_kernel_cy",
+        ["src/apf_kernel_cy.pyx"],
+        extra_compile_args=["-O3", "-ffast-math"],
+    ),
+]
+
+setup(
+    name="multiagent_swarms",
+    ext_modules=cythonize(extensions, language_level=3),
+)
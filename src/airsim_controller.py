@@ -4,7 +4,11 @@ Handles communication with AirSim drones
 """
 
 import airsim
+import asyncio
 import numpy as np
+import sys
+import threading
+from contextlib import contextmanager
 from typing import List, Tuple, Dict
 import time
 
@@ -20,36 +24,60 @@ class AirSimDroneController:
             drone_name: Name of the drone in AirSim
             verbose: Enable verbose output
         """
-        self.drone_name = drone_name
+        # Interned once: the name is re-serialized on every RPC, and
+        # interning keeps each call hitting the same cached string object
+        self.drone_name = sys.intern(drone_name)
         self.verbose = verbose
         self.client = None
         self.connected = False
         self.connected_ip = None
+        # Serializes RPC dispatch when a client is shared across threads;
+        # replaced by the swarm-wide lock when a shared client is injected
+        self._rpc_lock = threading.Lock()
+        # Throttle reconnect attempts so a dead sim doesn't make every
+        # command block on a fresh connect timeout
+        self._reconnect_cooldown = 5.0
+        self._last_reconnect_attempt = 0.0
         self.position = np.array([0.0, 0.0, 0.0])
         self.velocity = np.array([0.0, 0.0, 0.0])
         self.goal = np.array([0.0, 0.0, 0.0])
         
-    def connect(self, ip: str = "127.0.0.1"):
+    def connect(self, ip: str = "127.0.0.1", client=None, lock: threading.Lock = None,
+                timeout: float = None):
         """
         Connect to AirSim
-        
+
         Args:
             ip: AirSim server IP address
+            client: Optional already-connected MultirotorClient shared
+                    across the swarm (AirSim RPC is vehicle-name addressed,
+                    so one connection serves all drones)
+            lock: Lock guarding RPC dispatch on the shared client
+            timeout: Optional RPC timeout in seconds; without it a dead
+                     sim can hang confirmConnection for the full default
         """
         try:
-            self.client = airsim.MultirotorClient(ip=ip)
-            self.client.confirmConnection()
+            if client is not None:
+                self.client = client
+                if lock is not None:
+                    self._rpc_lock = lock
+            else:
+                if timeout is not None:
+                    self.client = airsim.MultirotorClient(ip=ip, timeout_value=timeout)
+                else:
+                    self.client = airsim.MultirotorClient(ip=ip)
+                self.client.confirmConnection()
             self.connected = True
             self.connected_ip = ip
-            self.log(f"Connected to AirSim at {ip}")
+            self.log("Connected to AirSim at %s", ip)
         except Exception as e:
-            self.log(f"Failed to connect: {e}")
+            self.log("Failed to connect: %s", e)
             raise
     
-    def log(self, message: str):
-        """Log message if verbose is enabled"""
+    def log(self, fmt: str, *args):
+        """Log message if verbose is enabled (lazy %-style formatting)"""
         if self.verbose:
-            print(f"[{self.drone_name}] {message}")
+            print(f"[{self.drone_name}] {fmt % args if args else fmt}")
     
     def arm(self):
         """Arm the drone"""
@@ -58,11 +86,12 @@ class AirSimDroneController:
             return
 
         try:
-            self.client.enableApiControl(True, self.drone_name)
-            self.client.armDisarm(True, self.drone_name)
+            with self._rpc_lock:
+                self.client.enableApiControl(True, self.drone_name)
+                self.client.armDisarm(True, self.drone_name)
             self.log("Armed")
         except Exception as e:
-            self.log(f"Failed to arm: {e}")
+            self.log("Failed to arm: %s", e)
     
     def disarm(self):
         """Disarm the drone"""
@@ -71,11 +100,12 @@ class AirSimDroneController:
             return
 
         try:
-            self.client.armDisarm(False, self.drone_name)
-            self.client.enableApiControl(False, self.drone_name)
+            with self._rpc_lock:
+                self.client.armDisarm(False, self.drone_name)
+                self.client.enableApiControl(False, self.drone_name)
             self.log("Disarmed")
         except Exception as e:
-            self.log(f"Failed to disarm: {e}")
+            self.log("Failed to disarm: %s", e)
     
     def takeoff(self, duration: float = 5.0):
         """
@@ -89,9 +119,10 @@ class AirSimDroneController:
             return None
 
         try:
-            return self.client.takeoffAsync(vehicle_name=self.drone_name)
+            with self._rpc_lock:
+                return self.client.takeoffAsync(vehicle_name=self.drone_name)
         except Exception as e:
-            self.log(f"Takeoff failed: {e}")
+            self.log("Takeoff failed: %s", e)
             return None
     
     def land(self):
@@ -101,9 +132,10 @@ class AirSimDroneController:
             return None
 
         try:
-            return self.client.landAsync(vehicle_name=self.drone_name)
+            with self._rpc_lock:
+                return self.client.landAsync(vehicle_name=self.drone_name)
         except Exception as e:
-            self.log(f"Land failed: {e}")
+            self.log("Land failed: %s", e)
             return None
     
     def update_position(self):
@@ -113,9 +145,15 @@ class AirSimDroneController:
             return
 
         try:
-            state = self.client.getMultirotorState(self.drone_name)
-            pos = state.kinematics_estimated.position
-            self.position = np.array([pos.x_val, pos.y_val, pos.z_val])
+            # Ground-truth kinematics returns just the kinematics struct,
+            # a fraction of the payload of the full multirotor state
+            with self._rpc_lock:
+                kin = self.client.simGetGroundTruthKinematics(vehicle_name=self.drone_name)
+            pos = kin.position
+            # Write in place: position may be a view into the swarm buffer
+            self.position[0] = pos.x_val
+            self.position[1] = pos.y_val
+            self.position[2] = pos.z_val
         except Exception:
             # ignore errors updating position
             return
@@ -125,7 +163,7 @@ class AirSimDroneController:
         Set velocity command
         
         Args:
-            velocity: Velocity vector [vx, vy, vz]
+            velocity: Velocity vector [vx, vy, vz] as an indexable array
             duration: Duration to apply velocity in seconds
         """
         if not self._ensure_connected():
@@ -133,15 +171,14 @@ class AirSimDroneController:
             return
 
         try:
-            self.client.moveByVelocityAsync(
-                velocity.x if hasattr(velocity, 'x') else velocity[0],
-                velocity.y if hasattr(velocity, 'y') else velocity[1],
-                velocity.z if hasattr(velocity, 'z') else velocity[2],
-                duration,
-                vehicle_name=self.drone_name
-            )
+            with self._rpc_lock:
+                self.client.moveByVelocityAsync(
+                    float(velocity[0]), float(velocity[1]), float(velocity[2]),
+                    duration,
+                    vehicle_name=self.drone_name
+                )
         except Exception as e:
-            self.log(f"moveByVelocityAsync failed: {e}")
+            self.log("moveByVelocityAsync failed: %s", e)
     
     def set_position(self, position: np.ndarray, velocity: float = 1.0):
         """
@@ -156,13 +193,14 @@ class AirSimDroneController:
             return None
 
         try:
-            return self.client.moveToPositionAsync(
-                position[0], position[1], position[2],
-                velocity,
-                vehicle_name=self.drone_name
-            )
+            with self._rpc_lock:
+                return self.client.moveToPositionAsync(
+                    position[0], position[1], position[2],
+                    velocity,
+                    vehicle_name=self.drone_name
+                )
         except Exception as e:
-            self.log(f"moveToPositionAsync failed: {e}")
+            self.log("moveToPositionAsync failed: %s", e)
             return None
 
     def _ensure_connected(self) -> bool:
@@ -173,13 +211,20 @@ class AirSimDroneController:
         try:
             # Try a lightweight call to verify transport is alive
             # getMultirotorState will raise if session/transport is invalid
-            _ = self.client.getMultirotorState(self.drone_name)
+            with self._rpc_lock:
+                _ = self.client.getMultirotorState(self.drone_name)
             return True
         except Exception:
-            # Attempt to reconnect if we have an IP saved
+            # Attempt to reconnect if we have an IP saved, but not more
+            # often than the cooldown: each failed attempt costs a full
+            # connect timeout and would otherwise stall every command
             if self.connected_ip:
+                now = time.monotonic()
+                if now - self._last_reconnect_attempt < self._reconnect_cooldown:
+                    return False
+                self._last_reconnect_attempt = now
                 try:
-                    self.connect(self.connected_ip)
+                    self.connect(self.connected_ip, timeout=2.0)
                     return True
                 except Exception:
                     return False
@@ -199,10 +244,19 @@ class AirSimSwarmController:
         """
         self.verbose = verbose
         self.drones: Dict[str, AirSimDroneController] = {}
-        
+        # Parallel list of controllers so hot paths avoid rebuilding
+        # list(self.drones.values()) every call
+        self._drone_list: List[AirSimDroneController] = []
+        self._shared_client = None
+        self._rpc_lock = threading.Lock()
+        # Swarm-level SoA state: (N, 3) arrays, per-drone attrs are row views
+        self.positions = None
+        self.velocities = None
+        self.goals = None
+
         if drone_names:
             for name in drone_names:
-                self.drones[name] = AirSimDroneController(name, verbose)
+                self.add_drone(name)
         
     def connect_all(self, ip: str = "127.0.0.1"):
         """
@@ -211,9 +265,13 @@ class AirSimSwarmController:
         Args:
             ip: AirSim server IP address
         """
+        # One client serves the whole swarm: AirSim RPC is vehicle-name
+        # addressed, so a single connection/handshake replaces N of them
+        self._shared_client = airsim.MultirotorClient(ip=ip)
+        self._shared_client.confirmConnection()
         for drone in self.drones.values():
-            drone.connect(ip)
-        self.log(f"Connected {len(self.drones)} drones")
+            drone.connect(ip, client=self._shared_client, lock=self._rpc_lock)
+        self.log("Connected %d drones", len(self.drones))
     
     def add_drone(self, drone_name: str):
         """
@@ -223,23 +281,85 @@ class AirSimSwarmController:
             drone_name: Name of the drone
         """
         if drone_name not in self.drones:
-            self.drones[drone_name] = AirSimDroneController(drone_name, self.verbose)
+            drone = AirSimDroneController(drone_name, self.verbose)
+            self.drones[drone_name] = drone
+            self._drone_list.append(drone)
     
-    def log(self, message: str):
-        """Log message if verbose is enabled"""
+    def log(self, fmt: str, *args):
+        """Log message if verbose is enabled (lazy %-style formatting)"""
         if self.verbose:
-            print(f"[Swarm] {message}")
+            print(f"[Swarm] {fmt % args if args else fmt}")
     
+    @contextmanager
+    def _paused_sim(self, continue_for: float = None):
+        """
+        Pause the simulator while commands are queued so every drone
+        receives its command in the same physics tick, instead of the
+        simulator advancing between serially dispatched RPCs.
+
+        Args:
+            continue_for: If given, advance the sim by exactly this many
+                          seconds after queuing before resuming free-run
+
+        Best-effort: without a shared client or pause support the block
+        simply runs unsynchronized.
+        """
+        client = self._shared_client
+        paused = False
+        if client is not None and hasattr(client, 'simPause'):
+            try:
+                with self._rpc_lock:
+                    client.simPause(True)
+                paused = True
+            except Exception:
+                paused = False
+        try:
+            yield
+        finally:
+            if paused:
+                try:
+                    with self._rpc_lock:
+                        if continue_for is not None:
+                            client.simContinueForTime(continue_for)
+                        client.simPause(False)
+                except Exception:
+                    pass
+
     def arm_all(self):
-        """Arm all drones"""
-        for drone in self.drones.values():
-            drone.arm()
+        """Arm all drones
+
+        The arm RPCs go through the shared client under a single lock
+        acquisition (the set_velocities batching idiom); threads can't
+        overlap on one client, so batching beats fanning out.
+        """
+        client = self._shared_client
+        if client is not None:
+            with self._rpc_lock:
+                for drone in self._drone_list:
+                    try:
+                        client.enableApiControl(True, drone.drone_name)
+                        client.armDisarm(True, drone.drone_name)
+                    except Exception as e:
+                        drone.log("Failed to arm: %s", e)
+        else:
+            for drone in self._drone_list:
+                drone.arm()
         self.log("All drones armed")
-    
+
     def disarm_all(self):
-        """Disarm all drones"""
-        for drone in self.drones.values():
-            drone.disarm()
+        """Disarm all drones (batched like arm_all)"""
+        client = self._shared_client
+        if client is not None:
+            with self._rpc_lock:
+                for drone in self._drone_list:
+                    try:
+                        client.armDisarm(False, drone.drone_name)
+                        client.enableApiControl(False, drone.drone_name)
+                    except Exception as e:
+                        drone.log("Failed to disarm: %s", e)
+        else:
+            for drone in self._drone_list:
+                drone.disarm()
         self.log("All drones disarmed")
     
     def takeoff_all(self, duration: float = 5.0):
@@ -277,18 +397,60 @@ class AirSimSwarmController:
         
         self.log("All drones landed")
     
+    def _ensure_state_buffers(self) -> List[AirSimDroneController]:
+        """
+        (Re)allocate the swarm-level SoA state arrays when the swarm size
+        changes and rebind each drone's position/velocity/goal as row
+        views, so per-drone updates land in the shared arrays and swarm
+        algorithms can run vectorized with zero gather cost.
+        """
+        drones = self._drone_list
+        n = len(drones)
+        if self.positions is None or self.positions.shape[0] != n:
+            # float32 throughout: meter-scale positions don't need double
+            # precision and the halved bandwidth pays off per control tick
+            self.positions = np.empty((n, 3), dtype=np.float32)
+            self.velocities = np.empty((n, 3), dtype=np.float32)
+            self.goals = np.empty((n, 3), dtype=np.float32)
+            for i, drone in enumerate(drones):
+                self.positions[i] = drone.position
+                self.velocities[i] = drone.velocity
+                self.goals[i] = drone.goal
+                drone.position = self.positions[i]
+                drone.velocity = self.velocities[i]
+                drone.goal = self.goals[i]
+        return drones
+
     def get_positions(self) -> np.ndarray:
         """
         Get positions of all drones
-        
+
         Returns:
-            Array of shape (N, 3) with drone positions
+            Array of shape (N, 3) with drone positions. The array is
+            reused between calls; copy it if it must survive the next poll.
         """
-        positions = []
-        for drone in self.drones.values():
-            drone.update_position()
-            positions.append(drone.position)
-        return np.array(positions)
+        drones = self._ensure_state_buffers()
+        client = self._shared_client
+        if client is not None:
+            # Poll every drone under a single lock acquisition (the
+            # set_velocities batching idiom); ground-truth kinematics is
+            # a fraction of the full multirotor state payload
+            with self._rpc_lock:
+                for drone in drones:
+                    try:
+                        kin = client.simGetGroundTruthKinematics(
+                            vehicle_name=drone.drone_name)
+                    except Exception:
+                        # keep previous position
+                        continue
+                    pos = kin.position
+                    drone.position[0] = pos.x_val
+                    drone.position[1] = pos.y_val
+                    drone.position[2] = pos.z_val
+        else:
+            for drone in drones:
+                drone.update_position()
+        return self.positions
     
     def set_velocities(self, velocities: np.ndarray, duration: float = 0.1):
         """
@@ -298,11 +460,41 @@ class AirSimSwarmController:
             velocities: Array of shape (N, 3) with velocities
             duration: Duration to apply velocities in seconds
         """
-        drone_list = list(self.drones.values())
-        for i, drone in enumerate(drone_list):
-            if i < len(velocities):
-                drone.set_velocity(velocities[i], duration)
+        # Convert once at the swarm boundary so per-drone calls index directly
+        velocities = np.ascontiguousarray(velocities, dtype=np.float32)
+        client = self._shared_client
+        with self._paused_sim(continue_for=duration):
+            if client is not None and hasattr(client, 'moveByVelocityAsync'):
+                # Fire-and-forget the whole batch through the shared client
+                # under a single lock acquisition; moveByVelocityAsync needs
+                # no join, the sim applies each command on resume
+                with self._rpc_lock:
+                    for drone, velocity in zip(self._drone_list, velocities):
+                        try:
+                            client.moveByVelocityAsync(
+                                float(velocity[0]), float(velocity[1]),
+                                float(velocity[2]), duration,
+                                vehicle_name=drone.drone_name
+                            )
+                        except Exception as e:
+                            drone.log("moveByVelocityAsync failed: %s", e)
+            else:
+                # zip truncates to the shorter sequence, no bounds check needed
+                for drone, velocity in zip(self._drone_list, velocities):
+                    drone.set_velocity(velocity, duration)
     
+    def set_position(self, index: int, position: np.ndarray, velocity: float = 1.0):
+        """
+        Send a single drone toward a target position (fire-and-forget)
+
+        Args:
+            index: Drone index in swarm order
+            position: Target position [x, y, z]
+            velocity: Maximum velocity during movement
+        """
+        if 0 <= index < len(self._drone_list):
+            self._drone_list[index].set_position(position, velocity)
+
     def set_positions(self, positions: np.ndarray, velocity: float = 1.0):
         """
         Set target positions for all drones simultaneously
@@ -311,12 +503,12 @@ class AirSimSwarmController:
             positions: Array of shape (N, 3) with target positions
             velocity: Maximum velocity during movement
         """
-        # Collect all async objects without blocking
+        # Collect all async objects without blocking; pause the sim while
+        # queuing so all drones start moving in the same tick
         tasks = []
-        drone_list = list(self.drones.values())
-        for i, drone in enumerate(drone_list):
-            if i < len(positions):
-                task = drone.set_position(positions[i], velocity)
+        with self._paused_sim():
+            for drone, position in zip(self._drone_list, positions):
+                task = drone.set_position(position, velocity)
                 if task:
                     tasks.append((drone.drone_name, task))
         
@@ -325,9 +517,53 @@ class AirSimSwarmController:
             task.join()
         
         # Update positions after all drones have moved
-        for drone in drone_list:
+        for drone in self._drone_list:
             drone.update_position()
     
+    async def takeoff_all_async(self, duration: float = 5.0):
+        """
+        Asyncio variant of takeoff_all: dispatch every takeoff, then await
+        all joins concurrently so the event loop stays free for other work
+        (e.g. polling positions while the swarm climbs).
+
+        Args:
+            duration: Duration of takeoff in seconds
+        """
+        tasks = [drone.takeoff(duration) for drone in self._drone_list]
+        await asyncio.gather(*[asyncio.to_thread(task.join)
+                               for task in tasks if task])
+        self.log("All drones launched")
+
+    async def land_all_async(self):
+        """Asyncio variant of land_all"""
+        tasks = [drone.land() for drone in self._drone_list]
+        await asyncio.gather(*[asyncio.to_thread(task.join)
+                               for task in tasks if task])
+        self.log("All drones landed")
+
+    async def set_positions_async(self, positions: np.ndarray, velocity: float = 1.0):
+        """
+        Asyncio variant of set_positions: queue all moves, then await a
+        single gather over the joins instead of blocking the caller
+
+        Args:
+            positions: Array of shape (N, 3) with target positions
+            velocity: Maximum velocity during movement
+        """
+        tasks = []
+        with self._paused_sim():
+            for drone, position in zip(self._drone_list, positions):
+                task = drone.set_position(position, velocity)
+                if task:
+                    tasks.append(task)
+
+        await asyncio.gather(*[asyncio.to_thread(task.join) for task in tasks])
+        await asyncio.to_thread(self.get_positions)
+
+    async def get_positions_async(self) -> np.ndarray:
+        """Asyncio variant of get_positions (runs the poll off-loop)"""
+        return await asyncio.to_thread(self.get_positions)
+
     def get_drone_count(self) -> int:
         """Get number of drones in swarm"""
         return len(self.drones)
@@ -0,0 +1,151 @@
+"""
+Compiled APF control kernel
+Fused pairwise force computation for APFSwarmController.get_control
+
+Preference order: the ahead-of-time Cython extension (no JIT cold-start,
+built via setup.py build_ext --inplace), then the Numba JIT kernel, then
+None (callers fall back to the NumPy implementation).
+"""
+
+import numpy as np
+
+try:
+    from .apf_kernel_cy import apf_get_control as _aot_apf_get_control
+    AOT_AVAILABLE = True
+except ImportError:
+    AOT_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _numba_apf_get_control(poses, goals, p_cohesion, p_separation,
+                               min_dist, max_vel, sep_l1, sep_weights, out):
+        """
+        Compute APF control velocities into a preallocated buffer.
+
+        Mirrors the semantics of the NumPy implementation in
+        APFSwarmController.get_control: goal-clipped cohesion, inverse
+        distance weighted repulsion scaled down near the goal, damped
+        vertical repulsion, and a final per-agent velocity clamp.
+
+        Args:
+            poses: (N, 3) float64 current positions
+            goals: (N, 3) float64 assigned goals
+            p_cohesion, p_separation, min_dist, max_vel: APF gains
+            sep_l1: 1 to gate repulsion on (weighted) Manhattan distance
+                    instead of Euclidean — no sqrt in the pair loop
+            sep_weights: (3,) per-axis weights applied inside the
+                         repulsion distance (anisotropic down-wash model)
+            out: (N, 3) float64 output buffer for velocity commands
+        """
+        n = poses.shape[0]
+        for i in prange(n):
+            # Cohesion: move toward goal, clipped per-agent
+            cx = p_cohesion * (goals[i, 0] - poses[i, 0])
+            cy = p_cohesion * (goals[i, 1] - poses[i, 1])
+            cz = p_cohesion * (goals[i, 2] - poses[i, 2])
+            c_mag = np.sqrt(cx * cx + cy * cy + cz * cz)
+            if c_mag > max_vel:
+                s = max_vel / c_mag
+                cx *= s
+                cy *= s
+                cz *= s
+
+            # Reduce separation influence when close to goal (within 1.0 m)
+            dist_to_goal = np.sqrt(
+                (goals[i, 0] - poses[i, 0]) ** 2
+                + (goals[i, 1] - poses[i, 1]) ** 2
+                + (goals[i, 2] - poses[i, 2]) ** 2
+            )
+            sep_scale = min(1.0, dist_to_goal / 1.0)
+            if sep_scale < 0.2:
+                sep_scale = 0.2
+
+            # Separation: inverse-distance weighted repulsion
+            rx = 0.0
+            ry = 0.0
+            rz = 0.0
+            for j in range(n):
+                if i == j:
+                    continue
+                dx = poses[i, 0] - poses[j, 0]
+                dy = poses[i, 1] - poses[j, 1]
+                dz = poses[i, 2] - poses[j, 2]
+                wx = dx * sep_weights[0]
+                wy = dy * sep_weights[1]
+                wz = dz * sep_weights[2]
+                if sep_l1 == 1:
+                    dist = abs(wx) + abs(wy) + abs(wz)
+                else:
+                    dist = np.sqrt(wx * wx + wy * wy + wz * wz)
+                if dist < 1e-6:
+                    # nearly coincident: apply a random small push
+                    rx += np.random.randn() * 0.1
+                    ry += np.random.randn() * 0.1
+                    rz += np.random.randn() * 0.1
+                    continue
+                if dist < min_dist:
+                    # weight stronger when closer (linear * inverse distance)
+                    weight = (min_dist - dist) / (dist + 1e-6)
+                    inv = weight / dist
+                    rx += dx * inv
+                    ry += dy * inv
+                    rz += dz * inv
+
+            # Reduce vertical repulsion to avoid aggressive altitude changes
+            rz *= 0.3
+
+            vx = cx + p_separation * sep_scale * rx
+            vy = cy + p_separation * sep_scale * ry
+            vz = cz + p_separation * sep_scale * rz
+
+            # Clamp combined velocity to max
+            v_mag = np.sqrt(vx * vx + vy * vy + vz * vz)
+            if v_mag > max_vel:
+                s = max_vel / v_mag
+                vx *= s
+                vy *= s
+                vz *= s
+
+            out[i, 0] = vx
+            out[i, 1] = vy
+            out[i, 2] = vz
+
+
+# Kernel selection: AOT extension first (predictable startup), JIT second
+KERNEL_AVAILABLE = AOT_AVAILABLE or NUMBA_AVAILABLE
+
+if AOT_AVAILABLE:
+
+    apf_get_control = _aot_apf_get_control
+
+    def warmup():
+        """No-op: the compiled extension has no JIT to trigger"""
+        pass
+
+elif NUMBA_AVAILABLE:
+
+    apf_get_control = _numba_apf_get_control
+
+    def warmup():
+        """Trigger JIT compilation once so the first control tick is fast"""
+        poses = np.zeros((2, 3), dtype=np.float64)
+        goals = np.ones((2, 3), dtype=np.float64)
+        weights = np.ones(3, dtype=np.float64)
+        out = np.empty_like(poses)
+        apf_get_control(poses, goals, 2.0, 1.0, 2.0, 1.0, 0, weights, out)
+
+else:
+
+    apf_get_control = None
+
+    def warmup():
+        """No-op when no compiled kernel is available"""
+        pass
@@ -7,15 +7,19 @@ import numpy as np
 import time
 import os
 import json
+import hashlib
 import datetime
 from typing import List, Optional
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from .llm_client import LLMClient, SDFGenerator
 from .airsim_controller import AirSimSwarmController
 from .swarm_controller import PointDistributor, APFSwarmController
 from .sdf_executor import SDFExecutor
 from .svg_utils import parse_and_sample
+from .hover_utils import hover_stats
+from . import hover_utils
 
 
 class LLMAirSimSwarmController:
@@ -77,6 +81,16 @@ class LLMAirSimSwarmController:
         self.goal_positions = None
         self.is_running = False
         self.control_thread = None
+        # Hover-loop scratch buffers (sized in start_mission)
+        self._diff_buf = None
+        self._dist_buf = None
+        # Latest (timestamp, positions) published by the producer thread
+        self._latest_pos = (0.0, None)
+        self._pos_lock = threading.Lock()
+        self._pos_thread = None
+        # SDF compile started while the LLM stream is still finishing
+        self._sdf_compile_pool = ThreadPoolExecutor(max_workers=1)
+        self._pending_sdf_fn = None
         
         # Parameters
         self.control_rate = 10  # Hz
@@ -90,7 +104,15 @@ class LLMAirSimSwarmController:
             os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "outputs")
         )
         os.makedirs(self.output_dir, exist_ok=True)
+        # On-disk cache for LLM shape -> waypoint results (LLM_CACHE=1)
+        self.llm_cache_dir = os.path.normpath(
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "llm_responses")
+        )
         
+        # Pay the hover-stats JIT compile cost up-front, not on the first
+        # tick of the control thread
+        hover_utils.warmup()
+
         # Try to connect to AirSim
         try:
             self.swarm.connect_all(airsim_ip)
@@ -119,22 +141,47 @@ class LLMAirSimSwarmController:
             self.flight_altitude = altitude
             self.log(f"Flight altitude set to {altitude}m")
     
+    def _compile_sdf_in_background(self, code: str):
+        """Kick off SDF compilation as soon as the code block is known"""
+        self._pending_sdf_fn = self._sdf_compile_pool.submit(
+            self.sdf_executor.create_sdf_function, code)
+
+    def _resolve_sdf_function(self):
+        """
+        Return the SDF function, preferring a background compile started
+        during the LLM stream; falls back to compiling inline (which is a
+        hash-cache hit if the background run already finished it).
+        """
+        future = self._pending_sdf_fn
+        self._pending_sdf_fn = None
+        if future is not None:
+            try:
+                sdf_func = future.result(timeout=60)
+                if sdf_func is not None:
+                    return sdf_func
+            except Exception:
+                pass
+        return self.sdf_executor.create_sdf_function(self.current_sdf_code)
+
     def describe_shape(self, description: str) -> bool:
         """
         Generate SDF code from shape description
-        
+
         Args:
             description: Natural language description of shape
-            
+
         Returns:
             True if successful
         """
         try:
             self.log(f"Generating SDF code for: {description}")
             self.current_shape_description = description
-            
-            # Generate SDF code
-            self.current_sdf_code = self.sdf_generator.generate_sdf_code(description)
+
+            # Generate SDF code; compilation starts the moment the code
+            # fence closes, overlapping with the rest of the LLM response
+            # handling (history append, cache store)
+            self.current_sdf_code = self.sdf_generator.generate_sdf_code(
+                description, on_code_ready=self._compile_sdf_in_background)
             
             if not self.current_sdf_code:
                 self.log("Failed to generate SDF code")
@@ -252,8 +299,8 @@ class LLMAirSimSwarmController:
                         self.log("No SDF code available. Call describe_shape() first.")
                         return False
 
-                    # Execute SDF code
-                    sdf_func = self.sdf_executor.create_sdf_function(self.current_sdf_code)
+                    # Execute SDF code (reusing the background compile)
+                    sdf_func = self._resolve_sdf_function()
                     if sdf_func is None:
                         self.log(f"Error: {self.sdf_executor.get_error_message()}")
                         return False
@@ -270,7 +317,7 @@ class LLMAirSimSwarmController:
                 if self.current_sdf_code is None:
                     self.log("No SDF code available for fallback. Call describe_shape() first.")
                     return False
-                sdf_func = self.sdf_executor.create_sdf_function(self.current_sdf_code)
+                sdf_func = self._resolve_sdf_function()
                 if sdf_func is None:
                     self.log(f"Error: {self.sdf_executor.get_error_message()}")
                     return False
@@ -282,7 +329,10 @@ class LLMAirSimSwarmController:
             # Transform waypoints to AirSim coordinates
             # AirSim uses NED (North-East-Down): Z negative is up
             # Scale and offset the shape to a suitable flight altitude
-            self.goal_positions = waypoints_relative * self.shape_scale
+            # float32 end to end: the hover loop and swarm buffers run in
+            # single precision, ample for meter-scale waypoints
+            self.goal_positions = np.asarray(
+                waypoints_relative * self.shape_scale, dtype=np.float32)
             # In NED: z=-10 means 10 meters altitude
             self.goal_positions[:, 2] = self.goal_positions[:, 2] - self.flight_altitude
             
@@ -318,26 +368,109 @@ class LLMAirSimSwarmController:
             self.log(f"Error generating waypoints: {e}")
             return False
     
+    def _mission_cache_path(self, shape_description: str, num_points: int) -> str:
+        """
+        Content-addressed cache file for a prepared mission: the key
+        covers the description, point count, model name and the SDF
+        system prompt, so a prompt or model change invalidates old hits.
+        """
+        key = hashlib.sha256(
+            f"{shape_description}|{num_points}|{self.llm_client.model}|{SDFGenerator.SDF_PROMPT}".encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.llm_cache_dir, f"{key}.json")
+
     def prepare_mission(self, shape_description: str, num_points: int = None) -> bool:
         """
         Complete preparation pipeline: shape description -> SDF -> waypoints
-        
+
+        With LLM_CACHE=1, identical (description, num_points) requests are
+        served from an on-disk cache instead of re-invoking the LLM.
+
         Args:
             shape_description: Natural language shape description
             num_points: Number of waypoints
-            
+
         Returns:
             True if successful
         """
+        if num_points is None:
+            num_points = len(self.drone_names)
+
+        cache_enabled = os.getenv("LLM_CACHE") == "1"
+        cache_path = self._mission_cache_path(shape_description, num_points)
+
+        if cache_enabled and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                self.current_shape_description = shape_description
+                self.current_sdf_code = cached.get("sdf_code")
+                self.goal_positions = np.array(cached["goals_ned"], dtype=np.float32)
+                self.log(f"Mission loaded from cache: {cache_path}")
+                return True
+            except Exception as e:
+                self.log(f"Warning: could not read mission cache: {e}")
+
         if not self.describe_shape(shape_description):
             return False
-        
+
         if not self.generate_waypoints(num_points):
             return False
-        
+
+        if cache_enabled:
+            try:
+                os.makedirs(self.llm_cache_dir, exist_ok=True)
+                with open(cache_path, "w", encoding="utf-8") as f:
+                    json.dump({
+                        "description": shape_description,
+                        "num_points": int(num_points),
+                        "sdf_code": self.current_sdf_code,
+                        "goals_ned": self.goal_positions.tolist(),
+                    }, f, indent=2, ensure_ascii=False)
+                self.log(f"Cached mission to {cache_path}")
+            except Exception as e:
+                self.log(f"Warning: could not write mission cache: {e}")
+
         self.log("Mission prepared successfully!")
         return True
 
+    def prepare_missions_batch(self, shapes: List[tuple]) -> dict:
+        """
+        Prepare several missions with the LLM calls overlapped.
+
+        Per-shape SDF generation is network-bound, so firing the requests
+        concurrently costs roughly one round-trip instead of N. Waypoint
+        generation then runs per shape on the already-fetched code.
+
+        Args:
+            shapes: List of (description, num_points) tuples
+
+        Returns:
+            Dict mapping description -> goal positions (None on failure)
+        """
+        def _generate(description):
+            # Isolated client per request so concurrent calls don't
+            # interleave the shared conversation history
+            client = LLMClient(self.llm_client.api_key,
+                               self.llm_client.base_url,
+                               self.llm_client.model)
+            return SDFGenerator(client).generate_sdf_code(description)
+
+        descriptions = [description for description, _ in shapes]
+        self.log(f"Generating SDF code for {len(descriptions)} shapes concurrently...")
+        with ThreadPoolExecutor(max_workers=min(8, len(shapes))) as executor:
+            codes = list(executor.map(_generate, descriptions))
+
+        results = {}
+        for (description, num_points), code in zip(shapes, codes):
+            self.current_shape_description = description
+            self.current_sdf_code = code or None
+            if self.generate_waypoints(num_points):
+                results[description] = self.goal_positions.copy()
+            else:
+                results[description] = None
+        return results
+
     def _generate_circle_points(self, num_points: int, radius: float = 1.0) -> np.ndarray:
         """
         Generate evenly spaced points on a horizontal circle in the XY plane.
@@ -488,6 +621,11 @@ class LLMAirSimSwarmController:
             max_time = 120.0
             t_start = time.time()
 
+            # Deadline scheduling on the monotonic clock: sleeping a
+            # fixed dt after each tick would add the tick's compute/RPC
+            # time on top and drift the loop below 2 Hz
+            next_tick = time.monotonic() + dt
+
             while True:
                 # Update current positions
                 current_positions = self.swarm.get_positions()
@@ -541,7 +679,14 @@ class LLMAirSimSwarmController:
                     self.log("Warning: APF control timed out before all drones reached goals")
                     break
 
-                time.sleep(dt)
+                # Sleep only the slack to the deadline; when behind,
+                # re-anchor instead of bursting to catch up
+                now = time.monotonic()
+                if next_tick > now:
+                    time.sleep(next_tick - now)
+                    next_tick += dt
+                else:
+                    next_tick = now + dt
 
             # Stop all drones (zero velocity) and snap to final positions
             self.swarm.set_velocities(np.zeros_like(assigned_goals), duration=0.5)
@@ -553,8 +698,19 @@ class LLMAirSimSwarmController:
 
             self.log("✓ APF-based movement complete")
             
-            # Start the hovering control loop to maintain positions
+            # Hover-loop scratch buffers, reused every tick so the loop
+            # allocates nothing while the mission holds position
+            n_drones = len(self.drone_names)
+            self._diff_buf = np.empty((n_drones, 3), dtype=np.float32)
+            self._dist_buf = np.empty(n_drones, dtype=np.float32)
+
+            # Start the hovering control loop to maintain positions; a
+            # separate producer thread owns the position RPC so control
+            # decisions never block on network jitter
             self.is_running = True
+            self._latest_pos = (0.0, None)
+            self._pos_thread = threading.Thread(target=self._position_producer, daemon=True)
+            self._pos_thread.start()
             self.control_thread = threading.Thread(target=self._hovering_control_loop, daemon=True)
             self.control_thread.start()
             
@@ -567,33 +723,83 @@ class LLMAirSimSwarmController:
             traceback.print_exc()
             return False
     
+    def _position_producer(self):
+        """
+        Poll swarm positions as fast as the RPC allows and publish the
+        latest snapshot for the control loop to read without blocking.
+        """
+        while self.is_running:
+            try:
+                positions = self.swarm.get_positions()
+                # get_positions reuses its buffer between polls; publish a
+                # copy so the control loop never reads a half-written tick
+                with self._pos_lock:
+                    self._latest_pos = (time.monotonic(), positions.copy())
+            except Exception:
+                time.sleep(self.control_dt)
+
     def _hovering_control_loop(self):
         """Control loop that keeps drones hovering at goal positions"""
         try:
-            hover_timeout = 0
+            # Deadline scheduling on the monotonic clock keeps the tick
+            # period at control_dt regardless of how long the work takes
+            next_tick = time.monotonic()
+            last_log = next_tick
             while self.is_running:
-                # Periodically check and maintain positions
-                positions = self.swarm.get_positions()
-                
+                # Read the freshest snapshot from the producer thread; a
+                # stale or missing one means the RPC is struggling, so
+                # skip the control decision rather than act on old data
+                with self._pos_lock:
+                    ts, positions = self._latest_pos
+                if positions is None or time.monotonic() - ts > 0.5:
+                    time.sleep(self.control_dt)
+                    continue
+
                 if positions.shape[0] > 0 and self.goal_positions is not None:
+                    n = positions.shape[0]
+                    goals = self.goal_positions[:n]
+
                     # Check if drones are close to their goal positions
-                    distances = np.linalg.norm(positions - self.goal_positions[:positions.shape[0]], axis=1)
-                    max_distance = np.max(distances)
-                    
-                    # If drones have drifted, send them back to goal
+                    # (fused max/mean pass, see hover_utils)
+                    max_distance, avg_distance = hover_stats(positions, goals)
+
+                    # If drones have drifted, send only the offenders back:
+                    # in steady state a single drifter shouldn't trigger a
+                    # full-swarm position broadcast
                     if max_distance > 0.5:  # threshold of 0.5 units
-                        self.swarm.set_positions(self.goal_positions, velocity=0.5)
-                    
-                    # Log status periodically (every 5 seconds)
-                    hover_timeout += 1
-                    if hover_timeout >= 50:  # 50 * 0.1s = 5s
-                        avg_distance = np.mean(distances)
+                        if self._dist_buf is None or self._dist_buf.shape[0] < n:
+                            self._diff_buf = np.empty((n, 3), dtype=np.float32)
+                            self._dist_buf = np.empty(n, dtype=np.float32)
+                        diff_buf = self._diff_buf[:n]
+                        dist_buf = self._dist_buf[:n]
+                        # Per-drone distances in place, reusing the
+                        # preallocated scratch buffers
+                        np.subtract(positions, goals, out=diff_buf)
+                        np.einsum('ij,ij->i', diff_buf, diff_buf, out=dist_buf)
+                        np.sqrt(dist_buf, out=dist_buf)
+                        drifted = np.flatnonzero(dist_buf > 0.5)
+                        if drifted.size > n // 2:
+                            # Most of the swarm moved; the broadcast is cheaper
+                            self.swarm.set_positions(self.goal_positions, velocity=0.5)
+                        else:
+                            for i in drifted:
+                                self.swarm.set_position(int(i), self.goal_positions[i], velocity=0.5)
+
+                    # Log status periodically (every 5 seconds, wall time
+                    # rather than an iteration count that drifts with load)
+                    if time.monotonic() - last_log >= 5.0:
                         self.log(f"Hovering: avg distance to goal = {avg_distance:.2f}m, max = {max_distance:.2f}m")
-                        hover_timeout = 0
-                
-                # Sleep
-                time.sleep(self.control_dt)
-                
+                        last_log = time.monotonic()
+
+                # Sleep until the next deadline; when behind, re-anchor
+                # instead of bursting to catch up
+                next_tick += self.control_dt
+                now = time.monotonic()
+                if next_tick > now:
+                    time.sleep(next_tick - now)
+                else:
+                    next_tick = now
+
         except Exception as e:
             self.log(f"Error in hovering control loop: {e}")
             self.stop_mission()
@@ -606,6 +812,8 @@ class LLMAirSimSwarmController:
             
             if self.control_thread:
                 self.control_thread.join(timeout=5.0)
+            if self._pos_thread:
+                self._pos_thread.join(timeout=5.0)
             
             # Land and disarm
             self.swarm.land_all()
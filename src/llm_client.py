@@ -3,11 +3,41 @@ LLM API Client - Integrated from NeLV/try.py
 Supports calling LLM APIs for SDF generation
 """
 
+from functools import cached_property, lru_cache
 from openai import OpenAI
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
 import os
 import json
 import re
+import threading
+
+import numpy as np
+
+try:
+    from .retry import retry_backoff
+except ImportError:  # imported flat with src/ on sys.path
+    from retry import retry_backoff
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+# Compiled once at import; extract_code_from_response runs per LLM reply
+_CODE_BLOCK_RE = re.compile(r'```(?:python)?\s*(.*?)```', re.DOTALL)
+_SAVE_RE = re.compile(r"""f\.save\(['"]out\.stl['"]\)""")
+
+
+@lru_cache(maxsize=8)
+def _get_openai(api_key: str, base_url: str) -> OpenAI:
+    """
+    Shared OpenAI client per (api_key, base_url).
+
+    Multiple controllers (e.g. multi-swarm launchers) then reuse one HTTP
+    connection pool instead of paying a fresh TLS handshake each.
+    """
+    return OpenAI(api_key=api_key, base_url=base_url)
 
 
 class LLMClient:
@@ -29,38 +59,108 @@ class LLMClient:
         self.base_url = base_url or os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
         self.model = model or os.getenv("LLM_MODEL", "gpt-3.5-turbo")
         
-        self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+        self.client = _get_openai(self.api_key, self.base_url)
         self.conversation_history = []
-        
-    def chat_completion(self, messages: List[Dict], temperature: float = 0.7) -> str:
+        # Rolling token budget for the history: without it every shape
+        # request re-sends all previous turns, growing the billed payload
+        # quadratically across a session
+        self.max_history_tokens = 4096
+
+    @cached_property
+    def _encoder(self):
+        """tiktoken encoder, or None to fall back to a chars/4 estimate"""
+        try:
+            import tiktoken
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+
+    def _count_tokens(self, messages: List[Dict]) -> int:
+        """Approximate token count of a message list"""
+        total = 0
+        for message in messages:
+            content = message.get("content", "")
+            if not isinstance(content, str):
+                content = json.dumps(content)
+            if self._encoder is not None:
+                total += len(self._encoder.encode(content))
+            else:
+                total += len(content) // 4 + 1
+        return total
+
+    def _trim_history(self):
+        """Drop oldest turns until the history fits the token budget"""
+        while (len(self.conversation_history) > 2
+               and self._count_tokens(self.conversation_history) > self.max_history_tokens):
+            self.conversation_history.pop(0)
+
+    def chat_completion(self, messages: List[Dict], temperature: float = 0.7,
+                        stop_on: Optional[Callable[[str], Optional[str]]] = None) -> str:
         """
         Generic chat completion wrapper
-        
+
         Args:
             messages: List of message dicts with 'role' and 'content'
             temperature: Sampling temperature
-            
+            stop_on: Optional early-termination check for streaming mode.
+                     Called with the accumulated text after each chunk;
+                     returning a non-None string aborts the stream and
+                     returns that string, skipping any trailing prose the
+                     model would otherwise keep emitting.
+
         Returns:
             Response text from the LLM
         """
         try:
+            return self._chat_completion(messages, temperature, stop_on)
+        except Exception as e:
+            print(f"Error calling LLM API: {e}")
+            return ""
+
+    @retry_backoff()
+    def _chat_completion(self, messages: List[Dict], temperature: float,
+                         stop_on: Optional[Callable[[str], Optional[str]]]) -> str:
+        """One API attempt; transient errors are retried by the decorator"""
+        if stop_on is None:
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 temperature=temperature
             )
             return response.choices[0].message.content.strip()
-        except Exception as e:
-            print(f"Error calling LLM API: {e}")
-            return ""
+
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            stream=True
+        )
+        text = ""
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            text += delta
+            done = stop_on(text)
+            if done is not None:
+                try:
+                    stream.close()
+                except Exception:
+                    pass
+                return done.strip()
+        return text.strip()
     
     def add_user_message(self, content: str):
         """Add user message to conversation history"""
         self.conversation_history.append({"role": "user", "content": content})
-    
+        self._trim_history()
+
     def add_assistant_message(self, content: str):
         """Add assistant message to conversation history"""
         self.conversation_history.append({"role": "assistant", "content": content})
+        self._trim_history()
     
     def clear_history(self):
         """Clear conversation history"""
@@ -124,15 +224,143 @@ f -= c.orient(X) | c.orient(Y) | c.orient(Z)
 - Must return valid Python code
 """
     
-    def __init__(self, llm_client: LLMClient):
+    def __init__(self, llm_client: LLMClient,
+                 cache_path: str = "sdf_cache.json",
+                 sim_threshold: float = 0.9):
         """
         Initialize SDF Generator
-        
+
         Args:
             llm_client: LLMClient instance for API calls
+            cache_path: JSON file persisting the exact-match cache
+                        (set to None to disable caching)
+            sim_threshold: Cosine similarity above which a previously
+                           generated shape is reused (semantic cache)
         """
         self.llm_client = llm_client
-    
+        self.cache_path = cache_path
+        self.sim_threshold = sim_threshold
+
+        # Two-tier cache: exact normalized-description hits skip the LLM
+        # entirely; near-duplicates ("cube" vs "a cube") are caught by
+        # cosine similarity over description embeddings
+        self._cache_lock = threading.Lock()
+        self._exact: Dict[str, str] = {}
+        self._descs: List[str] = []
+        self._codes: List[str] = []
+        self._embs = None  # (N, D) float32, rows unit-normalized
+        # With faiss, similarity search runs through its SIMD-blocked
+        # inner-product index instead of a linear NumPy scan
+        self._index = None
+
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    self._exact = json.load(f)
+            except Exception:
+                self._exact = {}
+
+    @staticmethod
+    def _normalize(description: str) -> str:
+        """Collapse case and whitespace so trivial variants share a key"""
+        return " ".join(description.lower().split())
+
+    @cached_property
+    def _embed_model(self):
+        """
+        Local sentence-transformer fallback for the semantic tier.
+
+        cached_property keeps the import and model load (seconds of torch
+        startup) off controller construction: it only materializes on the
+        first lookup where the provider embeddings endpoint is unusable,
+        and never for workloads that always hit the exact cache.
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+            return SentenceTransformer("all-MiniLM-L6-v2")
+        except Exception:
+            return None
+
+    def _embed(self, text: str):
+        """
+        Embed text for the semantic cache tier.
+
+        Returns a unit-normalized float32 vector, or None when neither
+        the provider embeddings endpoint nor the local fallback model is
+        available (the tier is then skipped).
+        """
+        try:
+            resp = self.llm_client.client.embeddings.create(
+                model=os.getenv("LLM_EMBED_MODEL", "text-embedding-3-small"),
+                input=text
+            )
+            emb = np.asarray(resp.data[0].embedding, dtype=np.float32)
+            return emb / (np.linalg.norm(emb) + 1e-12)
+        except Exception:
+            pass
+
+        model = self._embed_model
+        if model is None:
+            return None
+        try:
+            emb = model.encode([text], normalize_embeddings=True)[0]
+            return np.asarray(emb, dtype=np.float32)
+        except Exception:
+            return None
+
+    def _cache_lookup(self, key: str) -> str:
+        """Return cached code for key (exact, then semantic), or ''"""
+        with self._cache_lock:
+            code = self._exact.get(key)
+        if code:
+            return code
+
+        if self.sim_threshold is None or not self._descs:
+            return ""
+        emb = self._embed(key)
+        if emb is None:
+            return ""
+        with self._cache_lock:
+            if self._index is not None:
+                # Vectors are unit-normalized, so inner product == cosine
+                sims, ids = self._index.search(emb[None, :], 1)
+                if sims[0, 0] >= self.sim_threshold:
+                    return self._codes[int(ids[0, 0])]
+                return ""
+            sims = self._embs @ emb
+            best = int(np.argmax(sims))
+            if sims[best] >= self.sim_threshold:
+                return self._codes[best]
+        return ""
+
+    def _cache_store(self, key: str, code: str):
+        """Record a generated shape in both tiers and persist to disk"""
+        emb = self._embed(key)
+        with self._cache_lock:
+            self._exact[key] = code
+            if emb is not None:
+                self._descs.append(key)
+                self._codes.append(code)
+                if FAISS_AVAILABLE:
+                    if self._index is None:
+                        self._index = faiss.IndexFlatIP(emb.shape[0])
+                    self._index.add(emb[None, :])
+                else:
+                    row = emb[None, :]
+                    self._embs = row if self._embs is None else np.vstack([self._embs, row])
+            if self.cache_path:
+                try:
+                    # Write-then-rename so concurrent generators racing
+                    # on the same path never leave a partial file; the
+                    # pid/tid suffix keeps the temp names distinct
+                    tmp_path = (f"{self.cache_path}."
+                                f"{os.getpid()}.{threading.get_ident()}.tmp")
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump(self._exact, f, indent=2)
+                    os.replace(tmp_path, self.cache_path)
+                except OSError:
+                    pass  # persistence is best-effort
+
     def extract_code_from_response(self, response: str) -> str:
         """
         Extract Python code from LLM response
@@ -144,43 +372,91 @@ f -= c.orient(X) | c.orient(Y) | c.orient(Z)
             Extracted Python code (without save call)
         """
         # Find code block in response
-        pattern = r'```(?:python)?\s*(.*?)```'
-        matches = re.findall(pattern, response, re.DOTALL)
-        
+        matches = _CODE_BLOCK_RE.findall(response)
+
         if matches:
-            code = matches[-1]  # Take the last code block
-            # Remove save call
-            code = re.sub(r"f\.save\('out\.stl'\)", "", code)
-            code = re.sub(r'f\.save\("out\.stl"\)', "", code)
-            return code.strip()
-        
+            # Take the last code block; one pass strips either quote style
+            # of the save call
+            return _SAVE_RE.sub("", matches[-1]).strip()
+
         return ""
     
-    def generate_sdf_code(self, description: str) -> str:
+    def _system_message(self) -> Dict:
+        """
+        Build the static system message carrying the SDF grammar prompt.
+
+        The prompt never changes between calls, so it is kept as a stable
+        leading block; with LLM_PROMPT_CACHE=1 it is marked with
+        provider-native prefix caching (cache_control on Anthropic-style
+        endpoints), so repeated shape requests pay for the prefix once.
+        """
+        if os.getenv("LLM_PROMPT_CACHE") == "1":
+            content = [{
+                "type": "text",
+                "text": self.SDF_PROMPT,
+                "cache_control": {"type": "ephemeral"},
+            }]
+        else:
+            content = self.SDF_PROMPT
+        return {"role": "system", "content": content}
+
+    def generate_sdf_code(self, description: str,
+                          on_code_ready: Optional[Callable[[str], None]] = None) -> str:
         """
         Generate SDF code for a shape description
-        
+
         Args:
             description: Natural language description of the shape
-            
+            on_code_ready: Optional callback fired with the extracted code
+                           the moment the code block closes in the stream,
+                           so callers can start compiling it while response
+                           bookkeeping (history, caching) is still running
+
         Returns:
             Python code using sdf library
         """
-        # Build prompt
-        full_prompt = self.SDF_PROMPT + f"\n\n### Task:\nMake code to model a {description}\n\nRespond with ONLY the Python code block."
-        
+        # Cache hit skips the network round-trip entirely
+        key = self._normalize(description)
+        cached = self._cache_lookup(key)
+        if cached:
+            if on_code_ready is not None:
+                on_code_ready(cached)
+            return cached
+
+        # Only the short task varies per call; the SDF grammar lives in
+        # the system prefix instead of being re-sent in every user turn
+        task = f"### Task:\nMake code to model a {description}\n\nRespond with ONLY the Python code block."
+
         # Add to conversation
-        self.llm_client.add_user_message(full_prompt)
-        
-        # Get response
-        messages = self.llm_client.get_history()
-        response = self.llm_client.chat_completion(messages, temperature=0.7)
-        
+        self.llm_client.add_user_message(task)
+
+        # Get response: stable system prefix first, then the conversation.
+        # Stream and cut the response off once the code block closes — any
+        # explanation after the fence would be discarded anyway.
+        messages = [self._system_message()] + self.llm_client.get_history()
+
+        def _on_fence_closed(text: str) -> Optional[str]:
+            if text.count('```') < 2:
+                return None
+            if on_code_ready is not None:
+                early = self.extract_code_from_response(text)
+                if early:
+                    try:
+                        on_code_ready(early)
+                    except Exception:
+                        pass  # early compile is opportunistic
+            return text
+
+        response = self.llm_client.chat_completion(
+            messages, temperature=0.7, stop_on=_on_fence_closed)
+
         # Add assistant response
         self.llm_client.add_assistant_message(response)
-        
+
         # Extract code
         code = self.extract_code_from_response(response)
+        if code:
+            self._cache_store(key, code)
         return code
     
     def clear_context(self):
@@ -4,9 +4,55 @@ Examples of using RAG system for drone swarm control
 Demonstrates how RAG enhances task understanding and execution
 """
 
+import io
 import os
-from rag_system import QwenEmbedding, KnowledgeBase, RAGLLMClient
-from rag_integration import RAGEnhancedLLMClient, create_rag_enhanced_controller
+import sys
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+
+# Snapshot the API keys once at import; the environment check reads
+# this frozen view instead of re-querying os.environ
+_ENV = types.MappingProxyType({
+    k: os.environ.get(k, "") for k in ("OPENAI_API_KEY", "DASHSCOPE_API_KEY")
+})
+
+# The RAG stack pulls in numpy and the embedding SDK, so it is resolved
+# lazily (PEP 562) instead of at module import time — `--help` runs and
+# importing a single example stay cheap.
+_LAZY_IMPORTS = {
+    "QwenEmbedding": "rag_system",
+    "KnowledgeBase": "rag_system",
+    "RAGLLMClient": "rag_system",
+    "RAGEnhancedLLMClient": "rag_integration",
+    "create_rag_enhanced_controller": "rag_integration",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+@lru_cache(maxsize=1)
+def _get_embedding():
+    """Shared embedding client — each QwenEmbedding() opens its own
+    HTTP session, so the examples reuse a single instance."""
+    from rag_system import QwenEmbedding
+    return QwenEmbedding()
+
+
+@lru_cache(maxsize=1)
+def _get_rag_llm():
+    """Shared RAG-enhanced LLM client (and its embedding client)."""
+    from rag_integration import RAGEnhancedLLMClient
+    return RAGEnhancedLLMClient(use_rag=True)
 
 
 def example_1_basic_rag():
@@ -16,8 +62,10 @@ def example_1_basic_rag():
     print("="*70)
     
     try:
+        from rag_system import KnowledgeBase
+
         # Initialize embedding model
-        embedding = QwenEmbedding()
+        embedding = _get_embedding()
         
         # Create knowledge base
         kb = KnowledgeBase(embedding, "drone_kb_example1")
@@ -75,8 +123,8 @@ def example_2_rag_enhanced_llm():
     
     try:
         # Create RAG-enhanced LLM client
-        rag_llm = RAGEnhancedLLMClient(use_rag=True)
-        
+        rag_llm = _get_rag_llm()
+
         # Build knowledge base
         print("\nBuilding knowledge base...")
         
@@ -108,8 +156,8 @@ def example_3_rag_sdf_generation():
     
     try:
         # Create RAG-enhanced LLM client
-        rag_llm = RAGEnhancedLLMClient(use_rag=True)
-        
+        rag_llm = _get_rag_llm()
+
         print("\nGenerating SDF code for: 'A cube with 2 unit side length'")
         print("(Using RAG to enhance code quality)...\n")
         
@@ -137,6 +185,8 @@ def example_4_rag_controller():
     print("="*70)
     
     try:
+        from rag_integration import create_rag_enhanced_controller
+
         drone_names = [f"Drone{i}" for i in range(1, 6)]
         
         print(f"\nCreating RAG-enhanced controller with {len(drone_names)} drones...")
@@ -176,8 +226,10 @@ def example_5_load_custom_knowledge():
     print("="*70)
     
     try:
-        # Create a sample knowledge file
-        sample_file = "sample_knowledge.txt"
+        from rag_system import KnowledgeBase
+
+        # Sample knowledge kept in memory — no temp file round-trip
+        sample_name = "sample_knowledge"
         
         knowledge_content = """
         Drone Battery Management:
@@ -209,19 +261,14 @@ def example_5_load_custom_knowledge():
         - Video stream: High bandwidth, limited drones
         """
         
-        # Write sample file
-        with open(sample_file, 'w') as f:
-            f.write(knowledge_content)
-        
-        print(f"Created sample knowledge file: {sample_file}\n")
-        
-        # Load knowledge
-        embedding = QwenEmbedding()
+        # Load knowledge straight from memory
+        embedding = _get_embedding()
         kb = KnowledgeBase(embedding, "custom_kb")
-        
-        print("Loading knowledge from file...")
-        kb.add_documents_from_file(sample_file, chunk_size=300)
-        
+
+        print("Loading knowledge from in-memory stream...")
+        kb.add_documents_from_stream(io.StringIO(knowledge_content),
+                                     chunk_size=300, source=sample_name)
+
         kb.save_to_cache()
         
         # Test retrieval
@@ -234,19 +281,63 @@ def example_5_load_custom_knowledge():
             print(f"  {doc[:150]}...")
         
         print("\n✓ Example 5 completed successfully")
-        
-        # Clean up
-        import os
-        if os.path.exists(sample_file):
-            os.remove(sample_file)
-            print(f"Cleaned up {sample_file}")
-        
+
     except ValueError as e:
         print(f"⚠ Skipping example: {e}")
     except Exception as e:
         print(f"⚠ Example 5 note: {e}")
 
 
+class _ThreadLocalStdout:
+    """stdout proxy that routes each worker thread's writes into its own
+    buffer; threads without a buffer fall through to the real stream.
+
+    redirect_stdout swaps sys.stdout process-wide, which would mix the
+    concurrent examples' output — this keeps each example's transcript
+    intact.
+    """
+
+    def __init__(self, real):
+        self.real = real
+        self.local = threading.local()
+
+    def write(self, s):
+        buf = getattr(self.local, "buf", None)
+        return (buf if buf is not None else self.real).write(s)
+
+    def flush(self):
+        buf = getattr(self.local, "buf", None)
+        (buf if buf is not None else self.real).flush()
+
+
+def _run_examples_concurrently(examples):
+    """Run example functions on a thread pool, printing each one's
+    buffered output whole as it completes"""
+    proxy = _ThreadLocalStdout(sys.stdout)
+    print_lock = threading.Lock()
+
+    def run_buffered(fn):
+        proxy.local.buf = io.StringIO()
+        try:
+            fn()
+        finally:
+            text = proxy.local.buf.getvalue()
+            proxy.local.buf = None
+            with print_lock:
+                proxy.real.write(text)
+                proxy.real.flush()
+
+    real_stdout = sys.stdout
+    sys.stdout = proxy
+    try:
+        with ThreadPoolExecutor(max_workers=len(examples)) as pool:
+            futures = [pool.submit(run_buffered, fn) for fn in examples]
+            for future in as_completed(futures):
+                future.result()
+    finally:
+        sys.stdout = real_stdout
+
+
 def main():
     """Run all examples"""
     print("\n" + "="*70)
@@ -257,23 +348,27 @@ def main():
     
     # Check environment
     print("\nEnvironment Check:")
-    if os.getenv("DASHSCOPE_API_KEY"):
+    if _ENV["DASHSCOPE_API_KEY"]:
         print("  ✓ DASHSCOPE_API_KEY configured")
     else:
         print("  ⚠ DASHSCOPE_API_KEY not configured (needed for embedding)")
     
-    if os.getenv("OPENAI_API_KEY"):
+    if _ENV["OPENAI_API_KEY"]:
         print("  ✓ OPENAI_API_KEY configured")
     else:
         print("  ⚠ OPENAI_API_KEY not configured (needed for LLM)")
     
-    # Run examples
-    example_1_basic_rag()
-    example_2_rag_enhanced_llm()
-    example_3_rag_sdf_generation()
-    example_4_rag_controller()
-    example_5_load_custom_knowledge()
-    
+    # Run examples concurrently — each is dominated by independent
+    # network calls, so wall time approaches max(latencies) not the sum
+    examples = (
+        example_1_basic_rag,
+        example_2_rag_enhanced_llm,
+        example_3_rag_sdf_generation,
+        example_4_rag_controller,
+        example_5_load_custom_knowledge,
+    )
+    _run_examples_concurrently(examples)
+
     print("\n" + "="*70)
     print("All examples completed!")
     print("="*70)
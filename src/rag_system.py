@@ -5,43 +5,120 @@ Uses Qwen text-embedding-v4 for vector storage and retrieval
 
 import os
 import json
+import hashlib
 import numpy as np
+from functools import lru_cache
 from typing import List, Tuple, Optional
 from openai import OpenAI
 import pickle
 from pathlib import Path
 
+try:
+    from .retry import retry_backoff
+except ImportError:  # imported flat with src/ on sys.path
+    from retry import retry_backoff
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+
+@lru_cache(maxsize=256)
+def _embed_query_cached(embedding_model, query: str) -> bytes:
+    """
+    Cached query embedding per (embedding client, query string).
+
+    Interactive sessions and reruns repeat the same questions; a cache
+    hit turns the DashScope round-trip into a local lookup. Stored as
+    float32 bytes because ndarrays aren't hashable cache values.
+    """
+    return np.asarray(embedding_model.embed(query), dtype=np.float32).tobytes()
+
+
+@lru_cache(maxsize=8)
+def _get_openai(api_key: str, base_url: str) -> OpenAI:
+    """
+    Shared OpenAI-compatible client per (api_key, base_url).
+
+    A knowledge-base build issues one embedding call per document, so
+    reusing a single keep-alive connection pool saves a TCP+TLS
+    handshake per call.
+    """
+    return OpenAI(api_key=api_key, base_url=base_url)
+
 
 class QwenEmbedding:
     """Wrapper for Qwen embedding model"""
     
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 http_client=None):
         """
         Initialize Qwen embedding client
-        
+
         Args:
             api_key: DashScope API key (defaults to DASHSCOPE_API_KEY env var)
             base_url: API base URL (defaults to Beijing region)
+            http_client: Optional httpx.Client to share an existing
+                connection pool; by default the pooled client for this
+                (api_key, base_url) pair is reused
         """
         self.api_key = api_key or os.getenv("DASHSCOPE_API_KEY")
         self.base_url = base_url or "https://dashscope.aliyuncs.com/compatible-mode/v1"
-        
+
         if not self.api_key:
             raise ValueError("DASHSCOPE_API_KEY not set. Please set it in environment variables.")
-        
-        self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+
+        if http_client is not None:
+            self.client = OpenAI(api_key=self.api_key, base_url=self.base_url,
+                                 http_client=http_client)
+        else:
+            self.client = _get_openai(self.api_key, self.base_url)
         self.model = "text-embedding-v4"
-    
+
+        # Content-hash embedding cache; identical texts across calls
+        # (overlapping demo queries, reruns) skip the API entirely
+        self._cache = {}
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _cache_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters for the embedding cache"""
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "size": len(self._cache),
+        }
+
     def embed(self, text: str) -> np.ndarray:
         """
         Get embedding vector for text
-        
+
         Args:
             text: Input text to embed
-            
+
         Returns:
             Embedding vector as numpy array
         """
+        key = self._cache_key(text)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._hits += 1
+            return cached
+        self._misses += 1
+
+        embedding = self._embed_api(text)
+        self._cache[key] = embedding
+        return embedding
+
+    @retry_backoff()
+    def _embed_api(self, text: str) -> np.ndarray:
+        """Single-text embedding API call"""
         try:
             response = self.client.embeddings.create(
                 model=self.model,
@@ -52,20 +129,56 @@ class QwenEmbedding:
         except Exception as e:
             print(f"Error embedding text: {e}")
             raise
-    
+
+    # DashScope accepts up to 25 inputs per embeddings request
+    BATCH_LIMIT = 25
+
     def embed_batch(self, texts: List[str]) -> List[np.ndarray]:
         """
         Get embeddings for multiple texts
-        
+
+        Cached texts are served locally; only the misses go out, in one
+        API request per BATCH_LIMIT texts, so ingest cost is
+        bandwidth-bound rather than latency-bound.
+
         Args:
             texts: List of texts to embed
-            
+
         Returns:
             List of embedding vectors
         """
+        keys = [self._cache_key(t) for t in texts]
+        embeddings = [self._cache.get(k) for k in keys]
+
+        miss_idx = [i for i, e in enumerate(embeddings) if e is None]
+        self._hits += len(texts) - len(miss_idx)
+        self._misses += len(miss_idx)
+
+        if miss_idx:
+            fetched = self._embed_api_batch([texts[i] for i in miss_idx])
+            for i, emb in zip(miss_idx, fetched):
+                self._cache[keys[i]] = emb
+                embeddings[i] = emb
+
+        return embeddings
+
+    @retry_backoff()
+    def _embed_api_batch(self, texts: List[str]) -> List[np.ndarray]:
+        """Batched embedding API calls, chunked at BATCH_LIMIT"""
         embeddings = []
-        for text in texts:
-            embeddings.append(self.embed(text))
+        try:
+            for start in range(0, len(texts), self.BATCH_LIMIT):
+                batch = texts[start:start + self.BATCH_LIMIT]
+                response = self.client.embeddings.create(
+                    model=self.model,
+                    input=batch
+                )
+                # Response order is not guaranteed; sort by input index
+                for item in sorted(response.data, key=lambda d: d.index):
+                    embeddings.append(np.array(item.embedding))
+        except Exception as e:
+            print(f"Error embedding batch: {e}")
+            raise
         return embeddings
 
 
@@ -85,11 +198,29 @@ class KnowledgeBase:
         self.documents = []  # List of document texts
         self.embeddings = []  # List of embedding vectors
         self.metadata = []  # List of metadata dicts
-        self.cache_file = Path(f"{name}_cache.pkl")
+        # Lazily built quantized copy of self.embeddings: an int8 (N, D)
+        # matrix of row-normalized embeddings plus a float32 per-row
+        # scale. Search is then one int8 matrix-vector product — a
+        # quarter of the float32 memory traffic, and cosine top-k
+        # ordering is tolerant to the quantization noise.
+        self._emb_quant = None
+        self._ann_index = None
+        # float16 matrix + JSON metadata; the old pickle format is
+        # still read as a fallback
+        self.cache_file = Path(f"{name}_cache.npy")
+        self.meta_file = Path(f"{name}_cache.meta.json")
+        self._legacy_cache_file = Path(f"{name}_cache.pkl")
         
         # Try to load from cache
         self.load_from_cache()
-    
+
+    @staticmethod
+    def _unit(vec) -> np.ndarray:
+        """Float32 unit vector; stored rows are L2-normalized once at
+        ingest so cosine reduces to a plain dot product downstream"""
+        vec = np.asarray(vec, dtype=np.float32)
+        return vec / (np.linalg.norm(vec) + 1e-10)
+
     def add_document(self, text: str, metadata: Optional[dict] = None):
         """
         Add a document to the knowledge base
@@ -100,14 +231,40 @@ class KnowledgeBase:
         """
         # Embed the document
         embedding = self.embedding_model.embed(text)
-        
+
         # Store document and embedding
         self.documents.append(text)
-        self.embeddings.append(embedding)
+        self.embeddings.append(self._unit(embedding))
         self.metadata.append(metadata or {})
-        
+        self._emb_quant = None
+        self._ann_index = None
+
         print(f"✓ Added document ({len(text)} chars)")
-    
+
+    def add_documents(self, texts: List[str], metadatas: Optional[List[dict]] = None):
+        """
+        Add several documents with one batched embedding call
+
+        Args:
+            texts: List of document texts
+            metadatas: Optional list of metadata dicts, parallel to texts
+        """
+        if not texts:
+            return
+
+        embeddings = self.embedding_model.embed_batch(texts)
+
+        self.documents.extend(texts)
+        self.embeddings.extend(self._unit(e) for e in embeddings)
+        if metadatas is None:
+            self.metadata.extend({} for _ in texts)
+        else:
+            self.metadata.extend(m or {} for m in metadatas)
+        self._emb_quant = None
+        self._ann_index = None
+
+        print(f"✓ Added {len(texts)} documents")
+
     def add_documents_from_file(self, file_path: str, chunk_size: int = 500):
         """
         Load documents from a text file and chunk them
@@ -118,19 +275,36 @@ class KnowledgeBase:
         """
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Split into chunks
-            chunks = [content[i:i+chunk_size] for i in range(0, len(content), chunk_size)]
-            
-            for i, chunk in enumerate(chunks):
-                self.add_document(chunk, {"source": file_path, "chunk": i})
-            
-            print(f"✓ Loaded {len(chunks)} chunks from {file_path}")
-            
+                self.add_documents_from_stream(f, chunk_size, source=file_path)
+
         except Exception as e:
             print(f"Error loading file: {e}")
             raise
+
+    def add_documents_from_stream(self, stream, chunk_size: int = 500,
+                                  source: str = "<stream>"):
+        """
+        Chunk and add documents from any file-like text source
+
+        Lets callers feed in-memory content (e.g. io.StringIO) without a
+        disk round-trip.
+
+        Args:
+            stream: Open text stream (anything with .read())
+            chunk_size: Number of characters per chunk
+            source: Label recorded in each chunk's metadata
+        """
+        content = stream.read()
+
+        # Split into chunks and embed them in one batched call
+        chunks = [content[i:i+chunk_size] for i in range(0, len(content), chunk_size)]
+
+        self.add_documents(
+            chunks,
+            [{"source": source, "chunk": i} for i in range(len(chunks))]
+        )
+
+        print(f"✓ Loaded {len(chunks)} chunks from {source}")
     
     def add_documents_from_dict(self, docs_dict: dict):
         """
@@ -139,10 +313,10 @@ class KnowledgeBase:
         Args:
             docs_dict: Dict with keys as titles and values as content
         """
-        for title, content in docs_dict.items():
-            self.add_document(content, {"title": title})
-        
-        print(f"✓ Added {len(docs_dict)} documents")
+        self.add_documents(
+            list(docs_dict.values()),
+            [{"title": title} for title in docs_dict]
+        )
     
     def search(self, query: str, top_k: int = 3) -> List[Tuple[str, float, dict]]:
         """
@@ -157,55 +331,159 @@ class KnowledgeBase:
         """
         if not self.documents:
             return []
-        
-        # Embed the query
-        query_embedding = self.embedding_model.embed(query)
-        
-        # Calculate cosine similarity with all documents
-        similarities = []
-        for i, doc_embedding in enumerate(self.embeddings):
-            # Cosine similarity
-            similarity = np.dot(query_embedding, doc_embedding) / (
-                np.linalg.norm(query_embedding) * np.linalg.norm(doc_embedding) + 1e-10
-            )
-            similarities.append((i, similarity))
-        
-        # Sort by similarity and get top_k
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        
-        results = []
-        for idx, score in similarities[:top_k]:
-            results.append((
-                self.documents[idx],
-                float(score),
-                self.metadata[idx]
-            ))
-        
-        return results
+
+        # Embed the query (cached — repeated queries skip the API)
+        raw = _embed_query_cached(self.embedding_model, query)
+        query_embedding = np.frombuffer(raw, dtype=np.float32)
+
+        return self._search_local(query_embedding, top_k)
+
+    def search_batch(self, queries: List[str], top_k: int = 3) -> List[List[Tuple[str, float, dict]]]:
+        """
+        Search several queries with one batched embedding call
+
+        The embeddings for all queries go out in a single API request,
+        so N independent searches cost one round-trip instead of N.
+
+        Args:
+            queries: List of search queries
+            top_k: Number of top results per query
+
+        Returns:
+            One result list per query, in input order
+        """
+        if not self.documents or not queries:
+            return [[] for _ in queries]
+
+        query_embeddings = self.embedding_model.embed_batch(queries)
+
+        return [self._search_local(emb, top_k) for emb in query_embeddings]
+
+    # Below this corpus size brute force beats the ANN graph traversal
+    ANN_THRESHOLD = 1024
+
+    def _search_local(self, query_embedding, top_k: int) -> List[Tuple[str, float, dict]]:
+        """CPU-local similarity search for an already-embedded query"""
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        query_vec = query_vec / (np.linalg.norm(query_vec) + 1e-10)
+
+        # Large corpora go through the HNSW graph for sublinear top-k;
+        # small ones stay on the quantized brute-force scan
+        if FAISS_AVAILABLE and len(self.documents) >= self.ANN_THRESHOLD:
+            scores, idx = self._get_ann_index().search(
+                query_vec[None, :], min(top_k, len(self.documents)))
+            return [
+                (self.documents[i], float(s), self.metadata[i])
+                for i, s in zip(idx[0].tolist(), scores[0].tolist())
+                if i >= 0
+            ]
+
+        # Cosine similarity against all documents as one matrix-vector
+        # product over the quantized embedding matrix
+        mat_q, row_scale = self._get_emb_quant()
+        q_scale = max(float(np.abs(query_vec).max()), 1e-12) / 127.0
+        query_q = np.round(query_vec / q_scale).clip(-127, 127).astype(np.int32)
+        scores = (mat_q.astype(np.int32) @ query_q) * (row_scale * q_scale)
+
+        # argpartition selects top_k without fully sorting all N scores
+        top_k = min(top_k, len(self.documents))
+        top_idx = np.argpartition(-scores, top_k - 1)[:top_k]
+        top_idx = top_idx[np.argsort(-scores[top_idx])]
+
+        return [
+            (self.documents[idx], float(scores[idx]), self.metadata[idx])
+            for idx in top_idx.tolist()
+        ]
+
+    def _get_ann_index(self):
+        """HNSW index over the row-normalized embeddings, rebuilt lazily
+        after documents change
+
+        Inner product on unit vectors equals cosine, so the index
+        returns the same scores as the brute-force path.
+        """
+        if self._ann_index is None:
+            # Rows are unit-normalized at ingest, so no per-row norms here
+            mat = np.ascontiguousarray(np.stack(self.embeddings), dtype=np.float32)
+            index = faiss.IndexHNSWFlat(mat.shape[1], 32,
+                                        faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = 200
+            index.add(mat)
+            self._ann_index = index
+        return self._ann_index
+
+    def _get_emb_quant(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Quantized (int8 matrix, float32 per-row scale) view of the
+        stored embeddings, rebuilt lazily after documents change
+
+        Rows are unit-normalized at ingest and symmetrically quantized
+        here so that row * scale reconstructs the unit vector to ~1/127
+        precision.
+        """
+        if self._emb_quant is None:
+            mat = np.ascontiguousarray(np.stack(self.embeddings), dtype=np.float32)
+            row_scale = np.maximum(np.abs(mat).max(axis=1), 1e-12) / 127.0
+            mat_q = np.round(mat / row_scale[:, None]).clip(-127, 127).astype(np.int8)
+            self._emb_quant = (mat_q, row_scale.astype(np.float32))
+        return self._emb_quant
     
     def save_to_cache(self):
-        """Save knowledge base to cache file"""
+        """Save knowledge base to cache files
+
+        Embeddings go into one float16 .npy matrix (a quarter of the
+        float64 pickle's bytes, negligible cosine accuracy loss at
+        embedding dims), documents and metadata into a JSON sidecar.
+        """
         try:
-            cache_data = {
-                'documents': self.documents,
-                'embeddings': self.embeddings,
-                'metadata': self.metadata
-            }
-            with open(self.cache_file, 'wb') as f:
-                pickle.dump(cache_data, f)
+            if self.embeddings:
+                matrix = np.stack(self.embeddings).astype(np.float16)
+            else:
+                matrix = np.zeros((0, 0), dtype=np.float16)
+            np.save(self.cache_file, matrix)
+            with open(self.meta_file, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {'documents': self.documents, 'metadata': self.metadata,
+                     'normalized': True},
+                    f, ensure_ascii=False
+                )
             print(f"✓ Saved knowledge base cache to {self.cache_file}")
         except Exception as e:
             print(f"Error saving cache: {e}")
-    
+
     def load_from_cache(self):
-        """Load knowledge base from cache file"""
-        if self.cache_file.exists():
+        """Load knowledge base from cache files"""
+        if self.cache_file.exists() and self.meta_file.exists():
+            try:
+                with open(self.meta_file, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                # Memory-mapped: rows are paged in lazily as the search
+                # matrix is built, not copied up front
+                matrix = np.load(self.cache_file, mmap_mode='r')
+                self.documents = meta['documents']
+                if meta.get('normalized'):
+                    self.embeddings = list(matrix)
+                else:
+                    # Cache written before ingest-time normalization:
+                    # materialize and normalize the rows once
+                    self.embeddings = [self._unit(row) for row in matrix]
+                self.metadata = meta['metadata']
+                self._emb_quant = None
+                self._ann_index = None
+                print(f"✓ Loaded knowledge base cache with {len(self.documents)} documents")
+                return
+            except Exception as e:
+                print(f"Warning: Could not load cache: {e}")
+
+        # Fall back to the legacy pickle format
+        if self._legacy_cache_file.exists():
             try:
-                with open(self.cache_file, 'rb') as f:
+                with open(self._legacy_cache_file, 'rb') as f:
                     cache_data = pickle.load(f)
                 self.documents = cache_data['documents']
-                self.embeddings = cache_data['embeddings']
+                self.embeddings = [self._unit(e) for e in cache_data['embeddings']]
                 self.metadata = cache_data['metadata']
+                self._emb_quant = None
+                self._ann_index = None
                 print(f"✓ Loaded knowledge base cache with {len(self.documents)} documents")
             except Exception as e:
                 print(f"Warning: Could not load cache: {e}")
@@ -223,28 +501,35 @@ class KnowledgeBase:
 class RAGLLMClient:
     """LLM client enhanced with RAG"""
     
-    def __init__(self, knowledge_base: KnowledgeBase, api_key: Optional[str] = None, 
-                 base_url: Optional[str] = None, model: Optional[str] = None):
+    def __init__(self, knowledge_base: KnowledgeBase, api_key: Optional[str] = None,
+                 base_url: Optional[str] = None, model: Optional[str] = None,
+                 http_client=None):
         """
         Initialize RAG-enhanced LLM client
-        
+
         Args:
             knowledge_base: KnowledgeBase instance
             api_key: LLM API key (defaults to OPENAI_API_KEY)
             base_url: LLM API base URL
             model: LLM model name
+            http_client: Optional httpx.Client to share an existing
+                connection pool
         """
         self.knowledge_base = knowledge_base
-        
+
         # Initialize LLM client
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.base_url = base_url or os.getenv("OPENAI_BASE_URL")
         self.model = model or os.getenv("LLM_MODEL")
-        
+
         if not all([self.api_key, self.base_url, self.model]):
             raise ValueError("Missing LLM configuration. Set OPENAI_API_KEY, OPENAI_BASE_URL, LLM_MODEL")
-        
-        self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+
+        if http_client is not None:
+            self.client = OpenAI(api_key=self.api_key, base_url=self.base_url,
+                                 http_client=http_client)
+        else:
+            self.client = _get_openai(self.api_key, self.base_url)
     
     def query(self, user_query: str, top_k: int = 3, include_context: bool = True) -> str:
         """
@@ -0,0 +1,57 @@
+"""
+Retry helper for transient LLM/embedding API failures
+"""
+
+import functools
+import random
+import time
+
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
+
+# Failures worth retrying: rate limits, connection drops, timeouts and
+# server-side 5xx. Auth/validation errors (other 4xx) raise immediately.
+TRANSIENT_ERRORS = (
+    RateLimitError,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    TimeoutError,
+)
+
+
+def retry_backoff(max_retries: int = 3, base: float = 1.0, cap: float = 30.0,
+                  jitter: float = 0.5):
+    """
+    Decorator that retries transient API errors with exponential backoff
+
+    The delay grows as base * 2^attempt up to cap, plus up to
+    jitter*100% random extra so concurrent clients don't retry in
+    lockstep.
+
+    Args:
+        max_retries: Total attempts before the error propagates
+        base: Initial delay in seconds
+        cap: Maximum delay in seconds
+        jitter: Fraction of the delay added as random jitter
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            for attempt in range(max_retries):
+                try:
+                    return fn(*args, **kwargs)
+                except TRANSIENT_ERRORS as e:
+                    if attempt == max_retries - 1:
+                        raise
+                    delay = min(cap, base * (2 ** attempt))
+                    delay *= 1.0 + random.random() * jitter
+                    print(f"Transient API error: {e} — retrying in {delay:.1f}s "
+                          f"(attempt {attempt + 1}/{max_retries})")
+                    time.sleep(delay)
+        return wrapper
+    return decorator
@@ -4,29 +4,45 @@ Safely executes SDF code generated by LLM
 """
 
 import numpy as np
+from collections import OrderedDict
 from typing import Callable, Optional
+import hashlib
 import tempfile
 import os
 
 
 class SDFExecutor:
     """Executes SDF code and returns the SDF function"""
-    
+
+    # Bound on the number of compiled shapes kept alive per executor
+    CACHE_MAXSIZE = 32
+
     def __init__(self):
         """Initialize SDF executor"""
         self.last_function = None
         self.error_message = None
-    
+        # LRU of code hash -> executed 'f' object; re-running the same SDF
+        # (e.g. after a semantic cache hit upstream) skips the exec
+        self._fn_cache = OrderedDict()
+
     def execute_code(self, code: str) -> Optional[Callable]:
         """
         Execute SDF code and extract the 'f' function
-        
+
         Args:
             code: Python code using sdf library
-            
+
         Returns:
             The 'f' function object, or None if execution failed
         """
+        key = hashlib.blake2b(code.encode(), digest_size=16).hexdigest()
+        cached = self._fn_cache.get(key)
+        if cached is not None:
+            self._fn_cache.move_to_end(key)
+            self.last_function = cached
+            self.error_message = None
+            return cached
+
         try:
             # Create local namespace for execution
             local_vars = {}
@@ -50,6 +66,9 @@ class SDFExecutor:
             if "f" in local_vars:
                 self.last_function = local_vars["f"]
                 self.error_message = None
+                self._fn_cache[key] = self.last_function
+                if len(self._fn_cache) > self.CACHE_MAXSIZE:
+                    self._fn_cache.popitem(last=False)
                 return self.last_function
             else:
                 self.error_message = "No 'f' variable defined in SDF code"
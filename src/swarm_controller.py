@@ -6,10 +6,13 @@ Adapted from flock_gpt/scripts/
 import numpy as np
 from scipy.optimize import minimize
 from scipy.spatial.distance import cdist
-from scipy.spatial import ConvexHull, QhullError
+from scipy.spatial import ConvexHull, QhullError, cKDTree
 from sklearn.cluster import KMeans
 from typing import Callable, Tuple
 
+from .apf_kernel import apf_get_control, KERNEL_AVAILABLE
+from . import apf_kernel
+
 
 class PointDistributor:
     """
@@ -241,31 +244,49 @@ class APFSwarmController:
     Adapted from flock_gpt/scripts/apf_controller.py
     """
     
-    def __init__(self, 
+    def __init__(self,
                  p_cohesion: float = 2.0,
                  p_separation: float = 1.0,
                  p_alignment: float = 1.0,
                  max_vel: float = 1.0,
-                 min_dist: float = 2.0):
+                 min_dist: float = 2.0,
+                 sep_metric: str = 'L2',
+                 sep_axis_weights=None):
         """
         Initialize APF controller
-        
+
         Args:
             p_cohesion: Cohesion gain
             p_separation: Separation gain
             p_alignment: Alignment gain
             max_vel: Maximum velocity magnitude
             min_dist: Minimum distance between drones
+            sep_metric: Distance metric gating repulsion: 'L2' (default,
+                        Euclidean) or 'L1' (Manhattan, avoids the sqrt
+                        per pair and models anisotropic down-wash)
+            sep_axis_weights: Optional (3,) per-axis weights applied
+                              inside the repulsion distance
         """
         self.p_cohesion = p_cohesion
         self.p_separation = p_separation
         self.p_alignment = p_alignment
         self.max_vel = max_vel
         self.min_dist = min_dist
+        self.sep_metric = sep_metric
+        if sep_axis_weights is None:
+            self.sep_axis_weights = np.ones(3, dtype=np.float64)
+        else:
+            self.sep_axis_weights = np.asarray(sep_axis_weights, dtype=np.float64)
         
         self.goals = None
         self.velocities = None
-    
+        self._control_buf = None
+
+        # Absorb the one-off JIT compile cost at construction instead of
+        # on the first control tick
+        if KERNEL_AVAILABLE:
+            apf_kernel.warmup()
+
     def distribute_goals(self, current_poses: np.ndarray, goal_poses: np.ndarray) -> np.ndarray:
         """
         Distribute goals to drones (optimal assignment)
@@ -309,10 +330,32 @@ class APFSwarmController:
         """
         if self.goals is None or self.goals.shape[0] == 0:
             return np.zeros_like(poses)
-        
+
         if self.velocities is None:
             self.velocities = np.zeros_like(poses)
-        
+
+        # Fused compiled kernel when available: one pass over the pairwise
+        # interactions, no NumPy temporaries
+        if KERNEL_AVAILABLE and poses.shape == self.goals.shape:
+            # Follow the caller's precision: float32 inputs stay float32
+            # through the kernel (half the bandwidth on the pairwise loop)
+            dtype = np.float32 if poses.dtype == np.float32 else np.float64
+            if (self._control_buf is None
+                    or self._control_buf.shape != poses.shape
+                    or self._control_buf.dtype != dtype):
+                self._control_buf = np.empty_like(poses, dtype=dtype)
+            apf_get_control(
+                np.ascontiguousarray(poses, dtype=dtype),
+                np.ascontiguousarray(self.goals, dtype=dtype),
+                float(self.p_cohesion), float(self.p_separation),
+                float(self.min_dist), float(self.max_vel),
+                1 if self.sep_metric == 'L1' else 0,
+                np.ascontiguousarray(self.sep_axis_weights, dtype=dtype),
+                self._control_buf,
+            )
+            self.velocities = self._control_buf
+            return self._control_buf
+
         # Cohesion: move toward goals (higher priority)
         vel_cohesion = self.p_cohesion * (self.goals - poses)
 
@@ -324,35 +367,42 @@ class APFSwarmController:
 
         # Separation: inverse-distance weighted repulsion
         # Scaled down when close to goal to prevent oscillation
-        vel_separation = np.zeros_like(vel_cohesion)
-        n = poses.shape[0]
-        for i in range(n):
-            rep = np.zeros(3)
-            pi = poses[i]
-            gi = self.goals[i]
-            dist_to_goal = np.linalg.norm(gi - pi)
-            
-            # Reduce separation influence when close to goal (within 1.0 m)
-            sep_scale = max(0.2, min(1.0, dist_to_goal / 1.0))
-            
-            for j in range(n):
-                if i == j:
-                    continue
-                pj = poses[j]
-                diff = pi - pj
-                dist = np.linalg.norm(diff)
-                if dist < 1e-6:
-                    # nearly coincident: apply a random small push
-                    rep += np.random.randn(3) * 0.1
-                    continue
-                if dist < self.min_dist:
-                    # weight stronger when closer (linear * inverse distance)
-                    weight = (self.min_dist - dist) / (dist + 1e-6)
-                    rep += (diff / dist) * weight
+        #
+        # Repulsion is exactly zero beyond min_dist, so only pairs within
+        # that radius can contribute. A KD-tree on the weighted positions
+        # prunes the O(N^2) pair loop to the near pairs — for spread-out
+        # swarms in transit that is O(N) pairs or none at all. Weighted L1
+        # distance is never smaller than weighted L2, so the Euclidean
+        # query is a superset filter for the L1 metric too.
+        rep = np.zeros_like(poses, dtype=float)
+        tree = cKDTree(poses * self.sep_axis_weights)
+        pairs = tree.query_pairs(r=self.min_dist, output_type='ndarray')
+        for i, j in pairs:
+            diff = poses[i] - poses[j]
+            weighted = diff * self.sep_axis_weights
+            if self.sep_metric == 'L1':
+                dist = np.abs(weighted).sum()
+            else:
+                dist = np.linalg.norm(weighted)
+            if dist < 1e-6:
+                # nearly coincident: apply a random small push to each
+                rep[i] += np.random.randn(3) * 0.1
+                rep[j] += np.random.randn(3) * 0.1
+                continue
+            if dist < self.min_dist:
+                # weight stronger when closer (linear * inverse distance)
+                weight = (self.min_dist - dist) / (dist + 1e-6)
+                push = (diff / dist) * weight
+                rep[i] += push
+                rep[j] -= push
+
+        # Reduce vertical repulsion influence to avoid aggressive altitude changes
+        rep[:, 2] *= 0.3
 
-            # Reduce vertical repulsion influence to avoid aggressive altitude changes
-            rep[2] *= 0.3
-            vel_separation[i] = self.p_separation * sep_scale * rep
+        # Reduce separation influence when close to goal (within 1.0 m)
+        dist_to_goal = np.linalg.norm(self.goals - poses, axis=1)
+        sep_scale = np.clip(dist_to_goal, 0.2, 1.0)
+        vel_separation = self.p_separation * sep_scale[:, None] * rep
 
         # Combine forces and clamp to max velocity
         control_vels = vel_cohesion + vel_separation